@@ -0,0 +1,169 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import sys
+
+from graph import load_graph
+
+# Loaded once in the parent process; forked workers share it copy-on-write
+graph = None
+
+
+def person_for_field(field, by_id):
+    """
+    Resolves one side of a query to a person index without prompting.
+
+    Returns (person, error), where error is a message if the field does not
+    name exactly one person.
+    """
+    if by_id:
+        try:
+            return graph.index_for_person(field), None
+        except KeyError:
+            return None, "Person not found."
+    people = graph.people_for_name(field)
+    if len(people) == 0:
+        return None, "Person not found."
+    if len(people) > 1:
+        ids = ", ".join(graph.person_ids[person] for person in people)
+        return None, f"Ambiguous name, candidates: {ids}"
+    return people[0], None
+
+
+def read_queries(f, by_id):
+    """
+    Reads tab-separated source/target pairs and resolves them.
+
+    Returns a list of queries that could not be resolved as finished
+    records, and a dict mapping each source person to a list of
+    (line, target person) queries that share it.
+    """
+    failed = []
+    by_source = {}
+    resolved = {}
+    for line, row in enumerate(csv.reader(f, delimiter="\t"), start=1):
+        if not row:
+            continue
+        if len(row) != 2:
+            failed.append({"line": line, "error": "Expected a source and a target."})
+            continue
+
+        people = []
+        for field in row:
+            if field not in resolved:
+                resolved[field] = person_for_field(field, by_id)
+            people.append(resolved[field])
+        (source, source_error), (target, target_error) = people
+
+        if source_error or target_error:
+            failed.append({
+                "line": line,
+                "source": row[0],
+                "target": row[1],
+                "error": source_error or target_error
+            })
+        else:
+            by_source.setdefault(source, []).append((line, target))
+    return failed, by_source
+
+
+def read_all_pairs(f, by_id):
+    """
+    Reads one person per line and queries every pair of them.
+
+    Returns the same (failed, by_source) structure as read_queries, where
+    each person is the source for every person listed after it.
+    """
+    failed = []
+    people = []
+    for line, row in enumerate(csv.reader(f, delimiter="\t"), start=1):
+        if not row:
+            continue
+        person, error = person_for_field(row[0], by_id)
+        if error:
+            failed.append({"line": line, "source": row[0], "error": error})
+        else:
+            people.append((line, person))
+
+    by_source = {}
+    for i, (line, source) in enumerate(people):
+        for other_line, target in people[i + 1:]:
+            by_source.setdefault(source, []).append((other_line, target))
+    return failed, by_source
+
+
+def answer(task):
+    """
+    Answers every query for one source person from a single search tree.
+    """
+    source, queries = task
+    paths = graph.search_many(source, {target for line, target in queries})
+
+    records = []
+    for line, target in queries:
+        record = {
+            "line": line,
+            "source": graph.person_ids[source],
+            "target": graph.person_ids[target]
+        }
+        path = paths[target]
+        if path is None:
+            record["degrees"] = None
+        else:
+            record["degrees"] = len(path)
+            record["path"] = [[graph.movie_ids[movie], graph.person_ids[person]]
+                              for movie, person in path]
+        records.append(record)
+    return records
+
+
+def main():
+    global graph
+    parser = argparse.ArgumentParser(
+        description="Answer degrees-of-separation queries in bulk as JSONL."
+    )
+    parser.add_argument("queries", help="file of tab-separated source and target pairs")
+    parser.add_argument("--all-pairs", action="store_true",
+                        help="queries hold one person per line; answer every pair")
+    parser.add_argument("-d", "--directory", default="large",
+                        help="data directory (default: large)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--ids", action="store_true",
+                        help="queries hold IMDB person IDs instead of names")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of worker processes (default: 1)")
+    args = parser.parse_args()
+
+    graph = load_graph(args.directory)
+
+    with open(args.queries, encoding="utf-8", newline="") as f:
+        if args.all_pairs:
+            failed, by_source = read_all_pairs(f, args.ids)
+        else:
+            failed, by_source = read_queries(f, args.ids)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in failed:
+            output.write(json.dumps(record) + "\n")
+
+        tasks = list(by_source.items())
+        if args.workers > 1:
+            # Forked workers inherit the loaded graph instead of reloading it
+            context = multiprocessing.get_context("fork")
+            with context.Pool(args.workers) as pool:
+                for records in pool.imap_unordered(answer, tasks):
+                    for record in records:
+                        output.write(json.dumps(record) + "\n")
+        else:
+            for task in tasks:
+                for record in answer(task):
+                    output.write(json.dumps(record) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
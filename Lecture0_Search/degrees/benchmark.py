@@ -0,0 +1,110 @@
+import random
+import sys
+import time
+import tracemalloc
+
+import degrees_my as degrees
+from graph import load_graph
+
+
+def compare(pairs):
+    """
+    Runs the single-ended and bidirectional searches on every pair,
+    checking that both agree on the degrees of separation.
+
+    Returns a list of (source, target, degrees, bfs_explored, bfs_time,
+    bidir_explored, bidir_time) rows.
+    """
+    rows = []
+    for source, target in pairs:
+        start = time.perf_counter()
+        path = degrees.shortest_path(source, target)
+        bfs_time = time.perf_counter() - start
+        bfs_explored = degrees.num_explored
+
+        start = time.perf_counter()
+        bidir_path = degrees.bidirectional_shortest_path(source, target)
+        bidir_time = time.perf_counter() - start
+        bidir_explored = degrees.num_explored
+
+        length = None if path is None else len(path)
+        bidir_length = None if bidir_path is None else len(bidir_path)
+        if length != bidir_length:
+            raise Exception(f"path lengths differ for {source} -> {target}")
+
+        rows.append((source, target, length, bfs_explored, bfs_time,
+                     bidir_explored, bidir_time))
+    return rows
+
+
+def compare_graph(graph, pairs):
+    """
+    Runs the integer-indexed Graph search on every pair, checking that it
+    agrees with the dictionary-based search.
+
+    Returns a list of (explored, time) rows.
+    """
+    rows = []
+    for source, target in pairs:
+        start = time.perf_counter()
+        path = graph.shortest_path(source, target)
+        elapsed = time.perf_counter() - start
+
+        expected = degrees.bidirectional_shortest_path(source, target)
+        if (path is None) != (expected is None) or (path and len(path) != len(expected)):
+            raise Exception(f"graph path length differs for {source} -> {target}")
+        rows.append((graph.num_explored, elapsed))
+    return rows
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark.py [directory] [pairs]")
+    directory = sys.argv[1] if len(sys.argv) >= 2 else "large"
+    num_pairs = int(sys.argv[2]) if len(sys.argv) == 3 else 20
+
+    print("Loading data...")
+    tracemalloc.start()
+    degrees.load_data(directory)
+    dict_memory = tracemalloc.get_traced_memory()[0]
+    graph = load_graph(directory, cache=False)
+    graph_memory = tracemalloc.get_traced_memory()[0] - dict_memory
+    tracemalloc.stop()
+    print("Data loaded.")
+
+    random.seed(0)
+    person_ids = sorted(degrees.people)
+    pairs = [tuple(random.sample(person_ids, 2)) for _ in range(num_pairs)]
+
+    rows = compare(pairs)
+
+    print(f"{'source':>10} {'target':>10} {'degrees':>7} "
+          f"{'bfs explored':>12} {'bfs s':>8} {'bidir explored':>14} {'bidir s':>8}")
+    for source, target, length, bfs_explored, bfs_time, bidir_explored, bidir_time in rows:
+        length = "-" if length is None else length
+        print(f"{source:>10} {target:>10} {length:>7} "
+              f"{bfs_explored:>12} {bfs_time:>8.3f} {bidir_explored:>14} {bidir_time:>8.3f}")
+
+    bfs_explored = sum(row[3] for row in rows)
+    bfs_time = sum(row[4] for row in rows)
+    bidir_explored = sum(row[5] for row in rows)
+    bidir_time = sum(row[6] for row in rows)
+    print()
+    print(f"Total explored: {bfs_explored} (bfs) vs {bidir_explored} (bidirectional), "
+          f"{bfs_explored / max(bidir_explored, 1):.1f}x fewer")
+    print(f"Total time: {bfs_time:.3f}s (bfs) vs {bidir_time:.3f}s (bidirectional), "
+          f"{bfs_time / max(bidir_time, 1e-9):.1f}x faster")
+
+    graph_rows = compare_graph(graph, pairs)
+    graph_explored = sum(row[0] for row in graph_rows)
+    graph_time = sum(row[1] for row in graph_rows)
+    print()
+    print(f"Graph backend: {graph_explored} explored in {graph_time:.3f}s, "
+          f"{bfs_time / max(graph_time, 1e-9):.1f}x faster than dict bfs")
+    print(f"Memory: {dict_memory / 2 ** 20:.1f} MiB (dicts) vs "
+          f"{graph_memory / 2 ** 20:.1f} MiB (graph), "
+          f"{dict_memory / max(graph_memory, 1):.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
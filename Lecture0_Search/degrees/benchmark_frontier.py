@@ -0,0 +1,57 @@
+import sys
+import time
+
+from util import (Node, StackFrontier, QueueFrontier,
+                  DequeStackFrontier, DequeQueueFrontier)
+
+FRONTIERS = [
+    ("StackFrontier", StackFrontier),
+    ("DequeStackFrontier", DequeStackFrontier),
+    ("QueueFrontier", QueueFrontier),
+    ("DequeQueueFrontier", DequeQueueFrontier),
+]
+
+
+def grow_and_drain(frontier_class, size):
+    """
+    Grows a frontier to `size` nodes the way a search does, checking
+    contains_state before every add, then removes every node again.
+
+    Returns the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    frontier = frontier_class()
+    for state in range(size):
+        if not frontier.contains_state(state):
+            frontier.add(Node(state=state, parent=None, action=None))
+    while not frontier.empty():
+        frontier.remove()
+    return time.perf_counter() - start
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark_frontier.py [max_size] [max_list_size]")
+    max_size = int(sys.argv[1]) if len(sys.argv) >= 2 else 10 ** 6
+    max_list_size = int(sys.argv[2]) if len(sys.argv) == 3 else 10 ** 4
+
+    sizes = []
+    size = 1000
+    while size <= max_size:
+        sizes.append(size)
+        size *= 10
+
+    print(f"{'frontier':>20}" + "".join(f"{size:>12}" for size in sizes))
+    for name, frontier_class in FRONTIERS:
+        row = f"{name:>20}"
+        for size in sizes:
+            # The list-backed frontiers are quadratic, so cap their size
+            if not name.startswith("Deque") and size > max_list_size:
+                row += f"{'skipped':>12}"
+            else:
+                row += f"{grow_and_drain(frontier_class, size):>11.3f}s"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import random
+import sys
+import time
+
+from graph import load_graph
+from landmarks import LandmarkOracle
+
+
+def main():
+    if len(sys.argv) > 4:
+        sys.exit("Usage: python benchmark_landmarks.py [directory] [landmarks] [pairs]")
+    directory = sys.argv[1] if len(sys.argv) >= 2 else "large"
+    k = int(sys.argv[2]) if len(sys.argv) >= 3 else 8
+    num_pairs = int(sys.argv[3]) if len(sys.argv) == 4 else 50
+
+    print("Loading data...")
+    graph = load_graph(directory)
+    print("Data loaded.")
+
+    start = time.perf_counter()
+    oracle = LandmarkOracle(graph, k)
+    build_time = time.perf_counter() - start
+    print(f"Built {k} landmarks in {build_time:.3f}s, "
+          f"{oracle.memory / 2 ** 20:.1f} MiB of distance arrays.")
+
+    random.seed(0)
+    pairs = [tuple(random.sample(range(graph.num_people), 2)) for _ in range(num_pairs)]
+
+    bfs_time = bfs_explored = 0
+    astar_time = astar_explored = 0
+    bound_time = 0
+    exact_upper = 0
+    for source, target in pairs:
+        start = time.perf_counter()
+        path = graph.search(source, target)
+        bfs_time += time.perf_counter() - start
+        bfs_explored += graph.num_explored
+
+        start = time.perf_counter()
+        astar_path = oracle.shortest_path(source, target)
+        astar_time += time.perf_counter() - start
+        astar_explored += oracle.num_explored
+
+        start = time.perf_counter()
+        lower, upper = oracle.estimate(source, target)
+        bound_time += time.perf_counter() - start
+
+        if (path is None) != (astar_path is None) or (path and len(path) != len(astar_path)):
+            raise Exception(f"A* path length differs for {source} -> {target}")
+        if path is not None:
+            if lower is None or lower > len(path) or (upper is not None and upper < len(path)):
+                raise Exception(f"bounds {lower}, {upper} miss {len(path)}")
+            if upper == len(path):
+                exact_upper += 1
+
+    print(f"BFS: {bfs_explored} explored in {bfs_time:.3f}s")
+    print(f"A*:  {astar_explored} explored in {astar_time:.3f}s, "
+          f"{bfs_time / max(astar_time, 1e-9):.1f}x faster")
+    print(f"Bounds: {bound_time / num_pairs * 1e6:.1f}us per pair, "
+          f"upper bound exact for {exact_upper} of {num_pairs} pairs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 import csv
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
-from IPython.core.debugger import set_trace
+from nameindex import NameIndex
+from util import Node, StackFrontier, DequeQueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -13,6 +13,12 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Prefix and fuzzy lookup over every person's name, built by load_data
+name_index = None
+
+# Number of people expanded by the most recent search
+num_explored = 0
+
 
 def load_data(directory):
     """
@@ -52,6 +58,16 @@ def load_data(directory):
             except KeyError:
                 pass
 
+    # Index names for non-interactive lookups
+    global name_index
+    person_ids = list(people)
+    name_index = NameIndex(
+        person_ids,
+        [people[person_id]["name"] for person_id in person_ids],
+        [people[person_id]["birth"] for person_id in person_ids],
+        weights=[len(people[person_id]["movies"]) for person_id in person_ids]
+    )
+
 
 def main():
     if len(sys.argv) > 2:
@@ -72,7 +88,7 @@ def main():
         if target is None:
             sys.exit("Person not found.")
     
-        path = shortest_path(source, target)
+        path = bidirectional_shortest_path(source, target)
     
         if path is None:
             print("Not connected.")
@@ -106,11 +122,12 @@ def shortest_path(source, target):
     
     
     # TODO
-    # Keep track of number of movies explored
+    # Keep track of number of people explored
+    global num_explored
     num_explored = 0
     # Initialize frontier to just the starting position
     start = Node(state = source, parent = None, action = None)
-    frontier = QueueFrontier()
+    frontier = DequeQueueFrontier()
     frontier.add(start)
     # Initialize an empty explored set for person
     explored = set()
@@ -119,7 +136,7 @@ def shortest_path(source, target):
     while True:
         # if nothing left in the frontier, then no solution
         if frontier.empty():
-            path = None
+            return None
             
         # choose a node from the frontier
         node = frontier.remove()
@@ -149,6 +166,84 @@ def shortest_path(source, target):
     #raise NotImplementedError
 
 
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching from both ends.
+
+    Each round expands one whole BFS level of whichever frontier is smaller,
+    and the search stops as soon as a newly reached person has already been
+    reached from the other end. Because levels are expanded whole, the first
+    meeting person always lies on a shortest path.
+
+    If no possible path, returns None.
+    """
+    global num_explored
+    num_explored = 0
+
+    if source == target:
+        return []
+
+    # Maps each reached person to the (movie_id, person_id) step that reached
+    # it: the previous person for the forward search, the next one backward
+    forward = {source: None}
+    backward = {target: None}
+    forward_level = [source]
+    backward_level = [target]
+
+    while forward_level and backward_level:
+        if len(forward_level) <= len(backward_level):
+            forward_level, meet = expand_level(forward_level, forward, backward)
+        else:
+            backward_level, meet = expand_level(backward_level, backward, forward)
+        if meet is not None:
+            return join_paths(meet, forward, backward)
+
+    return None
+
+
+def expand_level(level, reached, other):
+    """
+    Expands every person in one BFS level.
+
+    Records newly reached people in `reached` and returns the next level,
+    along with the first person that was also reached by the `other` search
+    (or None if the two searches have not met yet).
+    """
+    global num_explored
+    next_level = []
+    for person_id in level:
+        num_explored += 1
+        for movie_id, neighbor_id in neighbors_for_person(person_id):
+            if neighbor_id in reached:
+                continue
+            reached[neighbor_id] = (movie_id, person_id)
+            if neighbor_id in other:
+                return next_level, neighbor_id
+            next_level.append(neighbor_id)
+    return next_level, None
+
+
+def join_paths(meet, forward, backward):
+    """
+    Joins the forward and backward search trees at the person `meet`
+    into a single list of (movie_id, person_id) pairs.
+    """
+    path = []
+    person_id = meet
+    while forward[person_id] is not None:
+        movie_id, parent_id = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent_id
+    path.reverse()
+
+    person_id = meet
+    while backward[person_id] is not None:
+        movie_id, person_id = backward[person_id]
+        path.append((movie_id, person_id))
+    return path
+
+
 def get_path(node):
     """
     Get path from source to target
@@ -196,6 +291,15 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def candidates_for_name(name, limit=10):
+    """
+    Returns up to `limit` ranked candidates for a possibly partial or
+    misspelled name, without prompting. Each candidate is a dict with
+    the person's id, name, birth, match kind and score.
+    """
+    return name_index.search(name, limit)
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
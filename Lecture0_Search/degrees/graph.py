@@ -0,0 +1,459 @@
+import csv
+import json
+import mmap
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import cached_property
+
+from nameindex import NameIndex
+
+# Identifies snapshot files written by save_snapshot
+SNAPSHOT_MAGIC = b"DEGSNAP1"
+SNAPSHOT_NAME = "graph.snapshot"
+SOURCE_FILES = ["people.csv", "movies.csv", "stars.csv"]
+
+# Int arrays and string tables stored in a snapshot, in file order
+SNAPSHOT_ARRAYS = ["person_offsets", "person_movies", "movie_offsets",
+                   "movie_people", "person_order", "name_order"]
+SNAPSHOT_STRINGS = ["person_ids", "person_names", "person_births",
+                    "movie_ids", "movie_titles", "movie_years"]
+
+
+class Graph():
+    """
+    Co-star graph with person and movie IDs interned to dense integers.
+
+    Person -> movie and movie -> person adjacency are stored in CSR form:
+    the movies of person `p` are `person_movies[person_offsets[p]:person_offsets[p + 1]]`,
+    and likewise for the people in a movie. All four are flat int arrays, so
+    searches work on integers and never build (movie_id, person_id) tuples
+    until a path is returned.
+
+    People are looked up by ID and by name through `person_order` and
+    `name_order`, which list person indices sorted by ID and by lowercase
+    name. A graph loaded from a snapshot keeps every array and string table
+    in the memory-mapped file, so nothing is decoded until it is used.
+    """
+
+    def __init__(self, person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies, movie_offsets, movie_people,
+                 person_order=None, name_order=None):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.person_births = person_births
+        self.movie_ids = movie_ids
+        self.movie_titles = movie_titles
+        self.movie_years = movie_years
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_people = movie_people
+
+        if person_order is None:
+            person_order = array("i", sorted(range(len(person_ids)),
+                                             key=person_ids.__getitem__))
+        if name_order is None:
+            name_order = array("i", sorted(range(len(person_names)),
+                                           key=lambda i: person_names[i].lower()))
+        self.person_order = person_order
+        self.name_order = name_order
+
+        # Number of people expanded by the most recent search
+        self.num_explored = 0
+
+    @property
+    def num_people(self):
+        return len(self.person_offsets) - 1
+
+    @property
+    def num_movies(self):
+        return len(self.movie_offsets) - 1
+
+    @cached_property
+    def name_index(self):
+        """Prefix and fuzzy name lookup, built on first use."""
+        offsets = self.person_offsets
+        weights = array("i", (offsets[i + 1] - offsets[i] for i in range(self.num_people)))
+        return NameIndex(self.person_ids, self.person_names, self.person_births,
+                         weights=weights, order=self.name_order)
+
+    def index_for_person(self, person_id):
+        """
+        Returns the person index of an IMDB person id.
+        Raises KeyError if there is no such person.
+        """
+        order = self.person_order
+        i = bisect_left(order, person_id, key=self.person_ids.__getitem__)
+        if i < len(order) and self.person_ids[order[i]] == person_id:
+            return order[i]
+        raise KeyError(person_id)
+
+    def people_for_name(self, name):
+        """Returns the person indices of everyone with a given name."""
+        name = name.lower()
+        key = lambda i: self.person_names[i].lower()
+        start = bisect_left(self.name_order, name, key=key)
+        end = bisect_right(self.name_order, name, lo=start, key=key)
+        return list(self.name_order[start:end])
+
+    def movies_for_person(self, person):
+        """Returns the movie indices of a person index."""
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def people_for_movie(self, movie):
+        """Returns the person indices of a movie index."""
+        return self.movie_people[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for people
+        who starred with a given person.
+        """
+        neighbors = set()
+        for movie in self.movies_for_person(self.index_for_person(person_id)):
+            for person in self.people_for_movie(movie):
+                neighbors.add((self.movie_ids[movie], self.person_ids[person]))
+        return neighbors
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target.
+
+        If no possible path, returns None.
+        """
+        path = self.search(self.index_for_person(source), self.index_for_person(target))
+        if path is None:
+            return None
+        return [(self.movie_ids[movie], self.person_ids[person])
+                for movie, person in path]
+
+    def search(self, source, target):
+        """
+        Breadth-first search between two person indices.
+
+        Returns the path as a list of (movie, person) index pairs,
+        or None if the two people are not connected.
+        """
+        return self.search_many(source, [target])[target]
+
+    def search_many(self, source, targets):
+        """
+        Breadth-first search from one person index to several targets,
+        sharing a single search tree between them.
+
+        Returns a dict mapping each target to its path as a list of
+        (movie, person) index pairs, or to None if it is not connected.
+        """
+        # Counted locally, so that searches in other threads do not mix their
+        # counts, and stored when the search ends
+        explored = 0
+        paths = {}
+        remaining = set(targets)
+        if source in remaining:
+            paths[source] = []
+            remaining.remove(source)
+
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+
+        # Once a movie has been expanded all of its stars have been reached,
+        # so each movie only needs to be expanded once per search
+        reached = bytearray(self.num_people)
+        expanded = bytearray(self.num_movies)
+        parent_person = array("i", [-1]) * self.num_people
+        parent_movie = array("i", [-1]) * self.num_people
+
+        reached[source] = 1
+        queue = [source] if remaining else []
+
+        # Iterating a list while appending to it visits the new items too
+        for person in queue:
+            explored += 1
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                if expanded[movie]:
+                    continue
+                expanded[movie] = 1
+                for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                    neighbor = movie_people[j]
+                    if reached[neighbor]:
+                        continue
+                    reached[neighbor] = 1
+                    parent_person[neighbor] = person
+                    parent_movie[neighbor] = movie
+                    if neighbor in remaining:
+                        paths[neighbor] = trace_path(neighbor, parent_person, parent_movie)
+                        remaining.remove(neighbor)
+                        if not remaining:
+                            self.num_explored = explored
+                            return paths
+                    queue.append(neighbor)
+
+        for target in remaining:
+            paths[target] = None
+        self.num_explored = explored
+        return paths
+
+
+def trace_path(person, parent_person, parent_movie):
+    """
+    Follows parent arrays back from `person` to the search root and
+    returns the (movie, person) index pairs in order from the root.
+    """
+    path = []
+    while parent_person[person] != -1:
+        path.append((parent_movie[person], person))
+        person = parent_person[person]
+    path.reverse()
+    return path
+
+
+def build_csr(num_rows, rows, columns):
+    """
+    Builds CSR offsets and indices from parallel arrays of (row, column)
+    entries, dropping duplicate entries within a row.
+    """
+    counts = array("i", [0]) * (num_rows + 1)
+    for row in rows:
+        counts[row + 1] += 1
+    for i in range(num_rows):
+        counts[i + 1] += counts[i]
+
+    indices = array("i", [0]) * len(rows)
+    position = array("i", counts[:num_rows])
+    for row, column in zip(rows, columns):
+        indices[position[row]] = column
+        position[row] += 1
+
+    # Sort each row and squeeze out duplicates in place
+    offsets = array("i", [0]) * (num_rows + 1)
+    size = 0
+    for row in range(num_rows):
+        for column in sorted(set(indices[counts[row]:counts[row + 1]])):
+            indices[size] = column
+            size += 1
+        offsets[row + 1] = size
+    del indices[size:]
+    return offsets, indices
+
+
+def load_graph(directory, cache=True):
+    """
+    Load data from CSV files into a Graph.
+
+    With `cache` set, a snapshot of the graph is kept next to the CSV files
+    and reused for as long as none of them have changed.
+    """
+    path = os.path.join(directory, SNAPSHOT_NAME)
+    sources = source_stamps(directory)
+    if cache:
+        graph = load_snapshot(path, sources)
+        if graph is not None:
+            return graph
+
+    graph = parse_csv(directory)
+    if cache:
+        try:
+            save_snapshot(graph, path, sources)
+        except OSError:
+            pass
+    return graph
+
+
+def parse_csv(directory):
+    """
+    Parse the CSV files in a directory into a Graph.
+    """
+    # Load people
+    person_ids = []
+    person_names = []
+    person_births = []
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            person_ids.append(row["id"])
+            person_names.append(row["name"])
+            person_births.append(row["birth"])
+    person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+
+    # Load movies
+    movie_ids = []
+    movie_titles = []
+    movie_years = []
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            movie_ids.append(row["id"])
+            movie_titles.append(row["title"])
+            movie_years.append(row["year"])
+    movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+    # Load stars
+    star_people = array("i")
+    star_movies = array("i")
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                person = person_index[row["person_id"]]
+                movie = movie_index[row["movie_id"]]
+            except KeyError:
+                continue
+            star_people.append(person)
+            star_movies.append(movie)
+
+    person_offsets, person_movies = build_csr(len(person_ids), star_people, star_movies)
+    movie_offsets, movie_people = build_csr(len(movie_ids), star_movies, star_people)
+
+    return Graph(person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies, movie_offsets, movie_people)
+
+
+class StringTable():
+    """
+    Read-only list of strings stored as UTF-8 bytes plus an offsets array,
+    decoding each string only when it is accessed.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("string table index out of range")
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def source_stamps(directory):
+    """
+    Returns the size and modification time of each CSV file,
+    which a snapshot must match to be reused.
+    """
+    stamps = {}
+    for name in SOURCE_FILES:
+        stat = os.stat(os.path.join(directory, name))
+        stamps[name] = [stat.st_size, stat.st_mtime_ns]
+    return stamps
+
+
+def save_snapshot(graph, path, sources):
+    """
+    Writes a graph to a snapshot file.
+
+    The file holds a JSON header followed by raw int arrays and string
+    tables, each aligned to 8 bytes so they can be cast in place from a
+    memory map. The header records the source file stamps and the layout.
+    """
+    sections = []
+    for name in SNAPSHOT_ARRAYS:
+        sections.append((name, "i", array("i", getattr(graph, name)).tobytes()))
+    for name in SNAPSHOT_STRINGS:
+        offsets = array("q", [0])
+        chunks = []
+        for string in getattr(graph, name):
+            chunk = string.encode("utf-8")
+            chunks.append(chunk)
+            offsets.append(offsets[-1] + len(chunk))
+        sections.append((f"{name}.offsets", "q", offsets.tobytes()))
+        sections.append((f"{name}.data", "B", b"".join(chunks)))
+
+    layout = {}
+    position = 0
+    for name, typecode, data in sections:
+        layout[name] = [position, len(data), typecode]
+        position += len(data) + -len(data) % 8
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "sources": sources,
+        "sections": layout
+    }).encode("utf-8")
+    header += b" " * (-len(header) % 8)
+
+    # Write to a temporary file first so a partial snapshot is never read
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for name, typecode, data in sections:
+            f.write(data)
+            f.write(b"\0" * (-len(data) % 8))
+    os.replace(temporary, path)
+
+
+def load_snapshot(path, sources):
+    """
+    Memory-maps a snapshot file and returns the graph it holds,
+    or None if there is no usable snapshot for the given source files.
+    """
+    try:
+        with open(path, "rb") as f:
+            snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if snapshot[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        return None
+    start = len(SNAPSHOT_MAGIC) + 8
+    header_size = int.from_bytes(snapshot[len(SNAPSHOT_MAGIC):start], "little")
+    try:
+        header = json.loads(bytes(snapshot[start:start + header_size]))
+    except ValueError:
+        return None
+
+    view = memoryview(snapshot)
+    body = start + header_size
+
+    def section(name):
+        offset, size, typecode = header["sections"][name]
+        if offset < 0 or size < 0 or body + offset + size > len(snapshot):
+            raise ValueError(f"section {name} is outside the snapshot")
+        return view[body + offset:body + offset + size].cast(typecode)
+
+    # A header from another version or a truncated or corrupt file is
+    # treated like a missing snapshot, so the graph is rebuilt
+    try:
+        if header["byteorder"] != sys.byteorder or header["sources"] != sources:
+            return None
+        arrays = {name: section(name) for name in SNAPSHOT_ARRAYS}
+        strings = {
+            name: StringTable(section(f"{name}.offsets"), section(f"{name}.data"))
+            for name in SNAPSHOT_STRINGS
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
+    return Graph(**strings, **arrays)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python graph.py [directory]")
+    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+
+    start = time.perf_counter()
+    graph = load_graph(directory)
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {graph.num_people} people and {graph.num_movies} movies "
+          f"in {elapsed:.3f}s.")
+
+
+if __name__ == "__main__":
+    main()
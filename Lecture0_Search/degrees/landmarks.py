@@ -0,0 +1,188 @@
+from array import array
+from heapq import heappop, heappush
+
+from graph import trace_path
+
+# Distance stored for people a landmark cannot reach, and the largest
+# distance that is stored exactly (anything further is stored as FAR)
+UNREACHABLE = 255
+FAR = UNREACHABLE - 1
+
+# Stands in for an infinite search cost
+INFINITY = 2 ** 31 - 1
+
+
+def bfs_distances(graph, source):
+    """
+    Returns a bytearray holding the degrees of separation from the person
+    index `source` to every person, with UNREACHABLE for people in other
+    components. Distances are capped at FAR.
+    """
+    distances = bytearray([UNREACHABLE]) * graph.num_people
+    expanded = bytearray(graph.num_movies)
+    person_offsets = graph.person_offsets
+    person_movies = graph.person_movies
+    movie_offsets = graph.movie_offsets
+    movie_people = graph.movie_people
+
+    distances[source] = 0
+    level = [source]
+    depth = 0
+    while level:
+        depth = min(depth + 1, FAR)
+        next_level = []
+        for person in level:
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                if expanded[movie]:
+                    continue
+                expanded[movie] = 1
+                for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                    neighbor = movie_people[j]
+                    if distances[neighbor] == UNREACHABLE:
+                        distances[neighbor] = depth
+                        next_level.append(neighbor)
+        level = next_level
+    return distances
+
+
+class LandmarkOracle():
+    """
+    Distance oracle over a Graph built from BFS distance arrays of K
+    high-degree landmark people.
+
+    By the triangle inequality, for every landmark L the distance between
+    a and b is at least |d(L, a) - d(L, b)| and at most d(L, a) + d(L, b).
+    The best of these bounds answers distance questions without searching,
+    and the lower bound is an admissible A* heuristic for exact paths.
+    Capping distances at FAR keeps lower bounds valid, so only upper
+    bounds skip landmarks that are FAR from either person.
+    """
+
+    def __init__(self, graph, k=8):
+        self.graph = graph
+
+        # People with the most movies make the best-connected landmarks
+        offsets = graph.person_offsets
+        self.landmarks = sorted(range(graph.num_people),
+                                key=lambda p: offsets[p + 1] - offsets[p],
+                                reverse=True)[:k]
+        self.distances = [bfs_distances(graph, landmark) for landmark in self.landmarks]
+
+        # Number of people expanded by the most recent search
+        self.num_explored = 0
+
+    @property
+    def memory(self):
+        """Returns the number of bytes used by the distance arrays."""
+        return sum(len(distances) for distances in self.distances)
+
+    def lower_bound(self, a, b):
+        """
+        Returns a lower bound on the degrees of separation between two person
+        indices, or None if a landmark proves they are not connected.
+        """
+        bound = 0
+        for distances in self.distances:
+            da = distances[a]
+            db = distances[b]
+            if (da == UNREACHABLE) != (db == UNREACHABLE):
+                return None
+            if da != UNREACHABLE:
+                bound = max(bound, abs(da - db))
+        return bound
+
+    def upper_bound(self, a, b):
+        """
+        Returns an upper bound on the degrees of separation between two person
+        indices, or None if no landmark reaches both of them.
+        """
+        bound = None
+        for distances in self.distances:
+            da = distances[a]
+            db = distances[b]
+            if da < FAR and db < FAR:
+                if bound is None or da + db < bound:
+                    bound = da + db
+        return bound
+
+    def estimate(self, a, b):
+        """
+        Returns (lower, upper) bounds on the degrees of separation between two
+        person indices, either of which is None if it is unknown.
+        """
+        if a == b:
+            return 0, 0
+        return self.lower_bound(a, b), self.upper_bound(a, b)
+
+    def shortest_path(self, source, target):
+        """
+        A* search between two person indices using the landmark lower bound
+        as the heuristic.
+
+        Returns the path as a list of (movie, person) index pairs,
+        or None if the two people are not connected.
+        """
+        self.num_explored = 0
+        if source == target:
+            return []
+        if self.lower_bound(source, target) is None:
+            return None
+
+        graph = self.graph
+        person_offsets = graph.person_offsets
+        person_movies = graph.person_movies
+        movie_offsets = graph.movie_offsets
+        movie_people = graph.movie_people
+
+        # Pair each landmark's distance array with its distance to the target
+        landmarks = [(distances, distances[target]) for distances in self.distances]
+
+        def heuristic(person):
+            bound = 0
+            for distances, to_target in landmarks:
+                distance = distances[person]
+                if distance == UNREACHABLE or to_target == UNREACHABLE:
+                    if distance != to_target:
+                        return INFINITY
+                elif abs(distance - to_target) > bound:
+                    bound = abs(distance - to_target)
+            return bound
+
+        # A* pops people out of BFS order, so a movie may later be reached
+        # more cheaply and is only skipped if it was expanded at no more cost
+        cost = array("i", [INFINITY]) * graph.num_people
+        movie_cost = array("i", [INFINITY]) * graph.num_movies
+        parent_person = array("i", [-1]) * graph.num_people
+        parent_movie = array("i", [-1]) * graph.num_people
+
+        cost[source] = 0
+        # Entries are (f, -g, person), so ties on f go to deeper people first
+        heap = [(heuristic(source), 0, source)]
+        while heap:
+            f, g, person = heappop(heap)
+            g = -g
+            if g > cost[person]:
+                continue
+            if person == target:
+                return trace_path(target, parent_person, parent_movie)
+            self.num_explored += 1
+
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                if movie_cost[movie] <= g:
+                    continue
+                movie_cost[movie] = g
+                for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                    neighbor = movie_people[j]
+                    if g + 1 >= cost[neighbor]:
+                        continue
+                    h = heuristic(neighbor)
+                    if h == INFINITY:
+                        continue
+                    cost[neighbor] = g + 1
+                    parent_person[neighbor] = person
+                    parent_movie[neighbor] = movie
+                    heappush(heap, (g + 1 + h, -(g + 1), neighbor))
+
+        return None
@@ -0,0 +1,176 @@
+from array import array
+from bisect import bisect_left
+from heapq import nlargest
+
+# Fuzzy lookups always count hits from at least this many of the query's
+# rarest trigrams, then keep adding trigrams until this many postings
+MIN_TRIGRAMS = 2
+MAX_POSTINGS = 5000
+
+# Number of best trigram-count candidates rescored by similarity
+MAX_CANDIDATES = 100
+
+# Fuzzy matches less similar than this are not worth suggesting
+MIN_SCORE = 0.3
+
+# Prefixes matching more names than this have their best matches cached,
+# up to PREFIX_CACHE_SIZE of them, instead of ranking every match again
+MAX_PREFIX_SCAN = 5000
+PREFIX_CACHE_SIZE = 50
+
+# Sorts after every character that appears in names
+LAST_CHARACTER = "\U0010ffff"
+
+EMPTY = array("i")
+
+
+def trigrams(name):
+    """Returns the set of character trigrams of a name, padded at both ends."""
+    name = f"  {name.lower()} "
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+
+class NameIndex():
+    """
+    Prefix and typo-tolerant lookup over a list of person names.
+
+    Prefix search bisects `order`, the person indices sorted by lowercase
+    name, for the range of names starting with the query, and ranks them by
+    weight. Fuzzy search looks up the query's trigrams in an inverted index,
+    counts hits starting from the rarest trigrams, and ranks the best
+    candidates by trigram similarity to the query.
+    """
+
+    def __init__(self, person_ids, names, births, weights=None, order=None):
+        self.person_ids = person_ids
+        self.names = names
+        self.births = births
+
+        # Ranks prefix matches and breaks ties between equally similar
+        # names, e.g. number of movies
+        self.weights = weights
+
+        # Maps prefixes with many matches to their best matches
+        self.prefix_cache = {}
+
+        if order is None:
+            order = array("i", sorted(range(len(names)), key=lambda i: names[i].lower()))
+        self.order = order
+
+        # Maps each trigram to the person indices whose names contain it
+        self.postings = {}
+        for i, name in enumerate(names):
+            for trigram in trigrams(name):
+                posting = self.postings.get(trigram)
+                if posting is None:
+                    posting = self.postings[trigram] = array("i")
+                posting.append(i)
+
+    def prefix_range(self, query):
+        """
+        Returns (start, end), the range of `order` whose names start with
+        `query`, which must be lowercase.
+        """
+        key = lambda i: self.names[i].lower()
+        start = bisect_left(self.order, query, key=key)
+        end = bisect_left(self.order, query + LAST_CHARACTER, lo=start, key=key)
+        return start, end
+
+    def prefix(self, query, limit=10):
+        """
+        Returns up to `limit` person indices whose names start with `query`,
+        highest weight first, and alphabetically among equal weights.
+        """
+        query = query.lower()
+        start, end = self.prefix_range(query)
+        if self.weights is None:
+            return list(self.order[start:min(end, start + limit)])
+        if end - start <= MAX_PREFIX_SCAN or limit > PREFIX_CACHE_SIZE:
+            return nlargest(limit, self.order[start:end], key=self.weights.__getitem__)
+
+        best = self.prefix_cache.get(query)
+        if best is None:
+            best = self.prefix_cache[query] = nlargest(
+                PREFIX_CACHE_SIZE, self.order[start:end], key=self.weights.__getitem__
+            )
+        return best[:limit]
+
+    def fuzzy(self, query, limit=10):
+        """
+        Returns up to `limit` (score, person index) pairs for the names most
+        similar to `query`, best first. Scores are the Jaccard similarity of
+        the two trigram sets, and names scoring below MIN_SCORE are left out.
+        """
+        query_trigrams = trigrams(query)
+        postings = sorted((self.postings.get(trigram, EMPTY) for trigram in query_trigrams),
+                          key=len)
+
+        counts = {}
+        total = 0
+        for n, posting in enumerate(postings):
+            if n >= MIN_TRIGRAMS and total + len(posting) > MAX_POSTINGS:
+                break
+            total += len(posting)
+            for person in posting:
+                counts[person] = counts.get(person, 0) + 1
+
+        scored = []
+        for person in nlargest(MAX_CANDIDATES, counts, key=counts.get):
+            name_trigrams = trigrams(self.names[person])
+            score = (len(query_trigrams & name_trigrams)
+                     / len(query_trigrams | name_trigrams))
+            if score < MIN_SCORE:
+                continue
+            weight = self.weights[person] if self.weights is not None else 0
+            scored.append((score, weight, person))
+        return [(score, person) for score, weight, person in nlargest(limit, scored)]
+
+    def search(self, query, limit=10):
+        """
+        Returns up to `limit` ranked candidates for a name, as dicts of
+        id, name, birth, match ("exact", "prefix" or "fuzzy") and score.
+        Exact matches come first, then prefix matches by weight, then fuzzy
+        ones.
+        """
+        if limit <= 0:
+            return []
+        lowered = query.lower()
+
+        # Names equal to the query sort first among those it is a prefix of
+        start, end = self.prefix_range(lowered)
+        exact = []
+        for i in range(start, end):
+            person = self.order[i]
+            if self.names[person].lower() != lowered:
+                break
+            exact.append(person)
+        if self.weights is not None:
+            exact.sort(key=self.weights.__getitem__, reverse=True)
+        exact = exact[:limit]
+
+        # The best `limit` prefix matches hold at most len(exact) exact ones,
+        # unless there are `limit` exact matches and no room for others
+        prefix = [person for person in self.prefix(query, limit)
+                  if self.names[person].lower() != lowered][:limit - len(exact)]
+
+        candidates = [self.candidate(person, "exact", 1.0) for person in exact]
+        for person in prefix:
+            candidates.append(self.candidate(person, "prefix", len(query) / len(self.names[person])))
+
+        if len(candidates) < limit:
+            seen = set(exact + prefix)
+            for score, person in self.fuzzy(query, limit + len(seen)):
+                if len(candidates) == limit:
+                    break
+                if person not in seen:
+                    candidates.append(self.candidate(person, "fuzzy", score))
+        return candidates
+
+    def candidate(self, person, match, score):
+        return {
+            "id": self.person_ids[person],
+            "name": self.names[person],
+            "birth": self.births[person],
+            "match": match,
+            "score": round(score, 3)
+        }
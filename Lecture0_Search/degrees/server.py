@@ -0,0 +1,242 @@
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from graph import load_graph
+from nameindex import PREFIX_CACHE_SIZE
+
+
+class PathCache():
+    """
+    Least-recently-used cache of shortest paths keyed by unordered pair of
+    person indices. Each path is stored from the lower index of the pair
+    and reversed on the way out when asked for the other direction.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source, target):
+        """
+        Returns (True, path) for a cached pair, or (False, None) on a miss.
+        """
+        key = (min(source, target), max(source, target))
+        if key not in self.paths:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self.paths.move_to_end(key)
+        path = self.paths[key]
+        if path is not None and source != key[0]:
+            path = reverse_path(key[0], path)
+        return True, path
+
+    def put(self, source, target, path):
+        key = (min(source, target), max(source, target))
+        if path is not None and source != key[0]:
+            path = reverse_path(source, path)
+        self.paths[key] = path
+        self.paths.move_to_end(key)
+        if len(self.paths) > self.capacity:
+            self.paths.popitem(last=False)
+
+
+class LatencyCounter():
+    """
+    Keeps the most recent request latencies for percentile reporting.
+    """
+
+    def __init__(self, window=10000):
+        self.latencies = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds):
+        self.latencies.append(seconds)
+        self.count += 1
+
+    def percentile(self, p):
+        """Returns the p-th percentile latency in seconds, or None."""
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        rank = max(0, min(len(latencies) - 1, int(round(p / 100 * len(latencies))) - 1))
+        return latencies[rank]
+
+
+def reverse_path(source, path):
+    """
+    Reverses a list of (movie, person) pairs that starts at `source`,
+    so that it starts at the last person of the path and ends at `source`.
+    """
+    people = [source] + [person for movie, person in path]
+    return [(path[i][0], people[i]) for i in reversed(range(len(path)))]
+
+
+class DegreesServer(ThreadingHTTPServer):
+    """
+    HTTP server that holds one loaded graph and a shared path cache.
+    """
+
+    def __init__(self, address, graph, cache_size):
+        super().__init__(address, DegreesHandler)
+        self.graph = graph
+        self.cache = PathCache(cache_size)
+        self.latency = LatencyCounter()
+        self.lock = threading.Lock()
+
+    def person_for_query(self, value):
+        """
+        Resolves a person ID, or a name that matches exactly one person,
+        to a person index. Returns None if that is not possible.
+        """
+        try:
+            return self.graph.index_for_person(value)
+        except KeyError:
+            pass
+        people = self.graph.people_for_name(value)
+        return people[0] if len(people) == 1 else None
+
+    def shortest_path(self, source, target):
+        """
+        Returns (path, cached) for two person indices, computing and
+        caching the path on a miss.
+
+        The lock is not held during the search, so cache hits are not kept
+        waiting behind a slow miss. Two misses on the same pair at once may
+        both search.
+        """
+        with self.lock:
+            cached, path = self.cache.get(source, target)
+        if cached:
+            return path, True
+        path = self.graph.search(source, target)
+        with self.lock:
+            self.cache.put(source, target, path)
+        return path, False
+
+    def metrics(self):
+        with self.lock:
+            p50 = self.latency.percentile(50)
+            p99 = self.latency.percentile(99)
+            return {
+                "requests": self.latency.count,
+                "cache_hits": self.cache.hits,
+                "cache_misses": self.cache.misses,
+                "cache_size": len(self.cache.paths),
+                "cache_capacity": self.cache.capacity,
+                "p50_ms": None if p50 is None else p50 * 1000,
+                "p99_ms": None if p99 is None else p99 * 1000
+            }
+
+
+class DegreesHandler(BaseHTTPRequestHandler):
+    """
+    Serves GET /path?source=...&target=..., GET /names?q=...&limit=...
+    and GET /metrics as JSON.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/path":
+            self.answer_path(parse_qs(url.query))
+        elif url.path == "/names":
+            self.answer_names(parse_qs(url.query))
+        elif url.path == "/metrics":
+            self.send_json(200, self.server.metrics())
+        else:
+            self.send_json(404, {"error": "Not found."})
+
+    def answer_path(self, query):
+        start = time.perf_counter()
+        if "source" not in query or "target" not in query:
+            self.send_json(400, {"error": "Expected source and target."})
+            return
+
+        graph = self.server.graph
+        source = self.server.person_for_query(query["source"][0])
+        target = self.server.person_for_query(query["target"][0])
+        if source is None or target is None:
+            self.send_json(404, {"error": "Person not found."})
+            return
+
+        path, cached = self.server.shortest_path(source, target)
+        result = {
+            "source": graph.person_ids[source],
+            "target": graph.person_ids[target],
+            "cached": cached
+        }
+        if path is None:
+            result["degrees"] = None
+        else:
+            result["degrees"] = len(path)
+            result["path"] = [[graph.movie_ids[movie], graph.person_ids[person]]
+                              for movie, person in path]
+
+        with self.server.lock:
+            self.server.latency.add(time.perf_counter() - start)
+        self.send_json(200, result)
+
+    def answer_names(self, query):
+        if "q" not in query:
+            self.send_json(400, {"error": "Expected q."})
+            return
+        try:
+            limit = int(query.get("limit", ["10"])[0])
+        except ValueError:
+            self.send_json(400, {"error": "limit must be an integer."})
+            return
+        if not 1 <= limit <= PREFIX_CACHE_SIZE:
+            self.send_json(400, {"error": f"limit must be between 1 and {PREFIX_CACHE_SIZE}."})
+            return
+        candidates = self.server.graph.name_index.search(query["q"][0], limit)
+        self.send_json(200, {"candidates": candidates})
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate latency at high request rates
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve degrees-of-separation queries over HTTP."
+    )
+    parser.add_argument("-d", "--directory", default="large",
+                        help="data directory (default: large)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-size", type=int, default=100000,
+                        help="number of paths to keep in the LRU cache")
+    args = parser.parse_args()
+
+    print("Loading data...")
+    graph = load_graph(args.directory)
+    graph.name_index
+    print("Data loaded.")
+
+    server = DegreesServer((args.host, args.port), graph, args.cache_size)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
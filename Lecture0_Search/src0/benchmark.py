@@ -0,0 +1,86 @@
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from generate import KINDS, generate, write_maze
+from maze import Maze, STRATEGIES
+
+SOLVERS = ["node", "indexed"]
+
+
+def run(maze, strategy, solver):
+    """
+    Solves a maze once, returning the number of states explored and the
+    solution length, or (explored, None) if there is no solution.
+    """
+    solve = maze.solve if solver == "node" else maze.solve_indexed
+    try:
+        solve(strategy)
+    except Exception as e:
+        if str(e) != "no solution":
+            raise
+        return maze.num_explored, None
+    return maze.num_explored, len(maze.solution[0])
+
+
+def measure(filename, strategy, solver):
+    """
+    Times one solve, then repeats it under tracemalloc for peak memory,
+    so that tracing does not distort the timing.
+
+    Returns (explored, solution length, peak memory in bytes, seconds).
+    """
+    maze = Maze(filename)
+    start = time.perf_counter()
+    explored, length = run(maze, strategy, solver)
+    elapsed = time.perf_counter() - start
+
+    maze = Maze(filename)
+    tracemalloc.start()
+    run(maze, strategy, solver)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return explored, length, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time every maze solve strategy across generated maze sizes."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[51, 101, 201, 401],
+                        help="side lengths of the square mazes to generate")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=KINDS)
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=SOLVERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    args = parser.parse_args()
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    writer = csv.writer(output)
+    writer.writerow(["kind", "size", "strategy", "solver", "explored",
+                     "solution_length", "peak_bytes", "seconds"])
+
+    with tempfile.TemporaryDirectory() as directory:
+        for kind in args.kinds:
+            for size in args.sizes:
+                filename = os.path.join(directory, f"{kind}{size}.txt")
+                write_maze(filename, generate(kind, size, size, args.seed))
+                for strategy in args.strategies:
+                    for solver in args.solvers:
+                        explored, length, peak, elapsed = measure(filename, strategy, solver)
+                        writer.writerow([kind, size, strategy, solver, explored,
+                                         "" if length is None else length,
+                                         peak, f"{elapsed:.6f}"])
+                        output.flush()
+
+    if output is not sys.stdout:
+        output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import random
+import sys
+
+WALL = ord("#")
+OPEN = ord(" ")
+
+KINDS = ["backtracker", "prim", "open"]
+
+
+def blank(height, width):
+    """Returns a grid of rows that are all wall."""
+    return [bytearray([WALL]) * width for _ in range(height)]
+
+
+def cells(height, width):
+    """
+    Returns the (row, col) cells of a maze lattice: every odd row and
+    column inside the border, so that walls sit between neighboring cells.
+    """
+    return [(i, j) for i in range(1, height - 1, 2) for j in range(1, width - 1, 2)]
+
+
+def lattice_neighbors(cell, height, width):
+    """Returns the lattice cells two steps away from a cell."""
+    i, j = cell
+    result = []
+    for di, dj in [(-2, 0), (2, 0), (0, -2), (0, 2)]:
+        if 1 <= i + di < height - 1 and 1 <= j + dj < width - 1:
+            result.append((i + di, j + dj))
+    return result
+
+
+def carve(grid, a, b):
+    """Opens cells a and b and the wall between them."""
+    grid[a[0]][a[1]] = OPEN
+    grid[(a[0] + b[0]) // 2][(a[1] + b[1]) // 2] = OPEN
+    grid[b[0]][b[1]] = OPEN
+
+
+def backtracker(height, width, rng):
+    """
+    Generates a perfect maze with an iterative recursive backtracker,
+    which makes long, winding corridors.
+    """
+    grid = blank(height, width)
+    start = (1, 1)
+    grid[1][1] = OPEN
+    visited = {start}
+    stack = [start]
+    while stack:
+        cell = stack[-1]
+        unvisited = [n for n in lattice_neighbors(cell, height, width) if n not in visited]
+        if not unvisited:
+            stack.pop()
+            continue
+        neighbor = rng.choice(unvisited)
+        carve(grid, cell, neighbor)
+        visited.add(neighbor)
+        stack.append(neighbor)
+    return grid
+
+
+def prim(height, width, rng):
+    """
+    Generates a perfect maze with randomized Prim's algorithm,
+    which makes many short dead ends.
+    """
+    grid = blank(height, width)
+    start = (1, 1)
+    grid[1][1] = OPEN
+    visited = {start}
+    walls = [(start, n) for n in lattice_neighbors(start, height, width)]
+    while walls:
+        # Swap a random wall to the end so it can be popped in O(1)
+        k = rng.randrange(len(walls))
+        walls[k], walls[-1] = walls[-1], walls[k]
+        cell, neighbor = walls.pop()
+        if neighbor in visited:
+            continue
+        carve(grid, cell, neighbor)
+        visited.add(neighbor)
+        for n in lattice_neighbors(neighbor, height, width):
+            if n not in visited:
+                walls.append((neighbor, n))
+    return grid
+
+
+def open_field(height, width, rng, density=0.25):
+    """
+    Generates an open field with walls scattered at random, which may
+    leave the start and goal disconnected.
+    """
+    grid = [bytearray(WALL if rng.random() < density else OPEN for _ in range(width))
+            for _ in range(height)]
+    return grid
+
+
+def generate(kind, height, width, seed=None):
+    """
+    Generates a maze of the given kind and size as a list of lines, with
+    the start "A" in the top left cell and the goal "B" in the bottom right.
+    """
+    if height < 3 or width < 3:
+        raise ValueError("maze must be at least 3x3")
+
+    # Lattice cells sit on odd rows and columns
+    goal = (height - 2 - (height % 2 == 0), width - 2 - (width % 2 == 0))
+    if goal == (1, 1):
+        raise ValueError("maze must be at least 5 high or 5 wide to fit both A and B")
+
+    rng = random.Random(seed)
+    if kind == "backtracker":
+        grid = backtracker(height, width, rng)
+    elif kind == "prim":
+        grid = prim(height, width, rng)
+    elif kind == "open":
+        grid = open_field(height, width, rng)
+    else:
+        raise ValueError(f"unknown maze kind {kind}")
+
+    grid[1][1] = ord("A")
+    grid[goal[0]][goal[1]] = ord("B")
+    return [row.decode("ascii") for row in grid]
+
+
+def write_maze(filename, lines):
+    """Writes maze lines in the text format read by Maze."""
+    with open(filename, "w") as f:
+        f.write("\n".join(lines))
+        f.write("\n")
+
+
+def main():
+    if len(sys.argv) not in [5, 6] or sys.argv[1] not in KINDS:
+        sys.exit(f"Usage: python generate.py {'|'.join(KINDS)} height width maze.txt [seed]")
+    kind = sys.argv[1]
+    height = int(sys.argv[2])
+    width = int(sys.argv[3])
+    seed = int(sys.argv[5]) if len(sys.argv) == 6 else None
+    write_maze(sys.argv[4], generate(kind, height, width, seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,46 @@
 import sys
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+
+# Maps each byte of a maze line to 1 for a wall and 0 for an open cell
+WALLS = bytes(0 if chr(b) in " AB" else 1 for b in range(256))
+
+# Maps wall bytes to the characters Maze.print draws
+RENDER = {0: " ", 1: "█"}
+
+# Maps wall bytes and Maze.solve_indexed marks to output_image palette indices
+WALL_COLORS = bytes([0, 1]) + bytes(254)
+EXPLORED_COLORS = bytes([0, 0, 2]) + bytes(253)
+
+# Palette indices and colors used by Maze.output_image
+EMPTY_COLOR = 0
+WALL_COLOR = 1
+EXPLORED_COLOR = 2
+SOLUTION_COLOR = 3
+START_COLOR = 4
+GOAL_COLOR = 5
+BORDER_COLOR = 6
+PALETTE = [
+    (237, 240, 252),
+    (40, 40, 40),
+    (212, 97, 85),
+    (220, 235, 113),
+    (255, 0, 0),
+    (0, 171, 28),
+    (0, 0, 0)
+]
+
+# Cell marks used by Maze.solve_indexed
+FRONTIER = 1
+EXPLORED = 2
 
 class Node():
-    def __init__(self, state, parent, action):
+    def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
         self.action = action
+        self.cost = cost
 
 
 class StackFrontier():
@@ -39,92 +75,227 @@ class QueueFrontier(StackFrontier):
             self.frontier = self.frontier[1:]
             return node
 
+
+class DequeStackFrontier():
+    """
+    Stack frontier backed by a deque, with a count of the states it holds
+    so that add, remove and contains_state are all O(1).
+    """
+    def __init__(self):
+        self.frontier = deque()
+        self.states = {}
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def discard_state(self, state):
+        count = self.states[state]
+        if count == 1:
+            del self.states[state]
+        else:
+            self.states[state] = count - 1
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.pop()
+            self.discard_state(node.state)
+            return node
+
+
+class DequeQueueFrontier(DequeStackFrontier):
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.popleft()
+            self.discard_state(node.state)
+            return node
+
+
+class PriorityFrontier():
+    """
+    Frontier that removes the node with the lowest priority first, where
+    `priority` is a function of the node. Ties go to the earliest added node.
+
+    Adding a node for a state that is already in the frontier keeps whichever
+    node has the lower priority. A replaced node is marked dead in place and
+    skipped when it reaches the top of the heap, instead of being searched
+    for and removed.
+    """
+    def __init__(self, priority):
+        self.priority = priority
+        self.frontier = []
+        self.entries = {}
+        self.count = 0
+
+    def add(self, node):
+        priority = self.priority(node)
+        entry = self.entries.get(node.state)
+        if entry is not None:
+            if entry[0] <= priority:
+                return
+            entry[2] = None
+        entry = [priority, self.count, node]
+        self.count += 1
+        self.entries[node.state] = entry
+        heappush(self.frontier, entry)
+
+    def contains_state(self, state):
+        return state in self.entries
+
+    def empty(self):
+        return len(self.entries) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        while True:
+            priority, count, node = heappop(self.frontier)
+            if node is not None:
+                del self.entries[node.state]
+                return node
+
+
 class Maze():
 
     def __init__(self, filename):
 
-        # Read file and set height and width of maze
+        # Read the file a line at a time, keeping one byte per cell
+        rows = []
+        starts = 0
+        goals = 0
         with open(filename) as f:
-            contents = f.read()
+            for i, line in enumerate(f):
+                line = line.rstrip("\r\n")
+                if "A" in line:
+                    starts += line.count("A")
+                    self.start = (i, line.index("A"))
+                if "B" in line:
+                    goals += line.count("B")
+                    self.goal = (i, line.index("B"))
+
+                # Characters outside latin-1 (like "█") become "?", still one byte each
+                rows.append(line.encode("latin-1", errors="replace").translate(WALLS))
 
         # Validate start and goal
-        if contents.count("A") != 1:
+        if starts != 1:
             raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
+        if goals != 1:
             raise Exception("maze must have exactly one goal")
 
         # Determine height and width of maze
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        # Keep track of walls
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+        self.height = len(rows)
+        self.width = max(len(row) for row in rows)
+
+        # Keep track of walls as one byte per cell, 1 for a wall, in a grid
+        # with a border of walls so that neighbors never fall off the edge.
+        # Short lines are padded with open cells.
+        self.stride = self.width + 2
+        border = b"\1" * self.stride
+        self.grid = bytearray(border + b"".join(
+            b"\1" + row.ljust(self.width, b"\0") + b"\1" for row in rows
+        ) + border)
+        del rows
+
+        # Offsets from a cell's index to the index of each neighbor
+        self.offsets = [
+            ("up", -self.stride),
+            ("down", self.stride),
+            ("left", -1),
+            ("right", 1)
+        ]
 
         self.solution = None
 
 
+    def index(self, state):
+        """Returns the grid index of a (row, col) cell."""
+        row, col = state
+        return (row + 1) * self.stride + col + 1
+
+
+    def state(self, index):
+        """Returns the (row, col) cell of a grid index."""
+        row, col = divmod(index, self.stride)
+        return (row - 1, col - 1)
+
+
+    def rows(self):
+        """Yields the wall bytes of each row of the maze, without the border."""
+        for i in range(self.height):
+            start = self.index((i, 0))
+            yield self.grid[start:start + self.width]
+
+
     def print(self):
-        solution = self.solution[1] if self.solution is not None else None
-        print()
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    print("█", end="")
-                elif (i, j) == self.start:
-                    print("A", end="")
-                elif (i, j) == self.goal:
-                    print("B", end="")
-                elif solution is not None and (i, j) in solution:
-                    print("*", end="")
-                else:
-                    print(" ", end="")
-            print()
-        print()
+        # Mark the solution, start and goal on top of whole rows of walls
+        marks = {}
+        if self.solution is not None:
+            for i, j in self.solution[1]:
+                marks.setdefault(i, []).append((j, "*"))
+        marks.setdefault(self.start[0], []).append((self.start[1], "A"))
+        marks.setdefault(self.goal[0], []).append((self.goal[1], "B"))
+
+        write = sys.stdout.write
+        write("\n")
+        for i, row in enumerate(self.rows()):
+            line = row.decode("latin-1").translate(RENDER)
+            if i in marks:
+                line = list(line)
+                for j, mark in marks[i]:
+                    line[j] = mark
+                line = "".join(line)
+            write(line + "\n")
+        write("\n")
 
 
     def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
-
+        index = self.index(state)
         result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
+        for action, offset in self.offsets:
+            if not self.grid[index + offset]:
+                result.append((action, self.state(index + offset)))
         return result
 
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def heuristic(self, state):
+        """Manhattan distance from a state to the goal."""
+        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
+
+
+    def solve(self, strategy="dfs"):
+        """
+        Finds a solution to maze, if one exists.
+
+        strategy is one of "dfs", "bfs", "greedy" (greedy best-first on
+        Manhattan distance) or "astar" (A* on Manhattan distance).
+        """
+        if strategy == "dfs":
+            frontier = DequeStackFrontier()
+        elif strategy == "bfs":
+            frontier = DequeQueueFrontier()
+        elif strategy == "greedy":
+            frontier = PriorityFrontier(lambda node: self.heuristic(node.state))
+        elif strategy == "astar":
+            frontier = PriorityFrontier(lambda node: node.cost + self.heuristic(node.state))
+        else:
+            raise ValueError(f"unknown strategy {strategy}")
 
         # Keep track of number of states explored
         self.num_explored = 0
 
         # Initialize frontier to just the starting position
         start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
         frontier.add(start)
 
         # Initialize an empty explored set
@@ -158,72 +329,206 @@ class Maze():
             self.explored.add(node.state)
 
             # Add neighbors to frontier
+            # A* also re-adds frontier states, so that a cheaper path replaces the old one
             for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
+                if state in self.explored:
+                    continue
+                if strategy == "astar" or not frontier.contains_state(state):
+                    child = Node(state=state, parent=node, action=action, cost=node.cost + 1)
                     frontier.add(child)
 
 
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 2
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
+    def solve_indexed(self, strategy="dfs"):
+        """
+        Finds a solution to maze like solve, visiting cells in the same order,
+        but works on grid indices instead of Nodes and (row, col) tuples.
+
+        Search state is kept in flat arrays: one byte per cell marking it as
+        in the frontier or explored, one byte per cell for the move that
+        reached it, and for A* one int per cell for its path cost.
+        """
+        if strategy not in ["dfs", "bfs", "greedy", "astar"]:
+            raise ValueError(f"unknown strategy {strategy}")
 
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
+        grid = self.grid
+        offsets = [offset for action, offset in self.offsets]
+        start = self.index(self.start)
+        goal = self.index(self.goal)
+        marks = bytearray(len(grid))
+        moves = bytearray(len(grid))
 
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
+        # Keep track of number of states explored
+        self.num_explored = 0
 
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
+        if strategy in ["dfs", "bfs"]:
+            frontier = deque([start])
+            remove = frontier.pop if strategy == "dfs" else frontier.popleft
+            marks[start] = FRONTIER
+            while frontier:
+                index = remove()
+                self.num_explored += 1
+                if index == goal:
+                    break
+                marks[index] = EXPLORED
+                for move, offset in enumerate(offsets):
+                    neighbor = index + offset
+                    if not grid[neighbor] and not marks[neighbor]:
+                        marks[neighbor] = FRONTIER
+                        moves[neighbor] = move
+                        frontier.append(neighbor)
+            else:
+                raise Exception("no solution")
+
+        else:
+            stride = self.stride
+            goal_row, goal_col = divmod(goal, stride)
+            astar = strategy == "astar"
+            cost = array("i", [0]) * len(grid) if astar else None
+
+            # Heap entries are (priority, insertion count, index), as in PriorityFrontier
+            heap = [(abs(start // stride - goal_row) + abs(start % stride - goal_col), 0, start)]
+            count = 1
+            marks[start] = FRONTIER
+            while True:
+                if not heap:
+                    raise Exception("no solution")
+                priority, _, index = heappop(heap)
+
+                # Skip entries replaced by a cheaper path to the same cell
+                if marks[index] == EXPLORED:
+                    continue
+                if astar and priority != cost[index] + abs(index // stride - goal_row) + abs(index % stride - goal_col):
+                    continue
+
+                self.num_explored += 1
+                if index == goal:
+                    break
+                marks[index] = EXPLORED
+                for move, offset in enumerate(offsets):
+                    neighbor = index + offset
+                    if grid[neighbor] or marks[neighbor] == EXPLORED:
+                        continue
+                    if astar:
+                        if marks[neighbor] == FRONTIER and cost[neighbor] <= cost[index] + 1:
+                            continue
+                        cost[neighbor] = cost[index] + 1
+                    elif marks[neighbor] == FRONTIER:
+                        continue
+                    marks[neighbor] = FRONTIER
+                    moves[neighbor] = move
+                    row, col = divmod(neighbor, stride)
+                    priority = abs(row - goal_row) + abs(col - goal_col)
+                    if astar:
+                        priority += cost[neighbor]
+                    heappush(heap, (priority, count, neighbor))
+                    count += 1
+
+        # Follow moves back from the goal
+        actions = []
+        cells = []
+        index = goal
+        while index != start:
+            action, offset = self.offsets[moves[index]]
+            actions.append(action)
+            cells.append(self.state(index))
+            index -= offset
+        actions.reverse()
+        cells.reverse()
+        self.solution = (actions, cells)
+        self.explored = ExploredCells(self, marks)
+
+
+    def output_image(self, filename, show_solution=True, show_explored=False,
+                     cell_size=50, cell_border=2):
+        """
+        Draws the maze as one palette byte per cell, scales it up in bulk and
+        then draws the borders as one stripe per row and column, rather than
+        drawing every cell separately.
+        """
+        from PIL import Image, ImageDraw
+
+        # Explored cells are never walls, so their marks can be OR-ed in
+        explored = self.explored if self.solution is not None and show_explored else None
+        cells = bytearray()
+        for i, row in enumerate(self.rows()):
+            row = row.translate(WALL_COLORS)
+            if isinstance(explored, ExploredCells):
+                start = self.index((i, 0))
+                marks = explored.marks[start:start + self.width].translate(EXPLORED_COLORS)
+                row = (int.from_bytes(row, "big") | int.from_bytes(marks, "big")).to_bytes(self.width, "big")
+            cells += row
+        if explored is not None and not isinstance(explored, ExploredCells):
+            for i, j in explored:
+                cells[i * self.width + j] = EXPLORED_COLOR
+        if self.solution is not None and show_solution:
+            for i, j in self.solution[1]:
+                cells[i * self.width + j] = SOLUTION_COLOR
+        cells[self.start[0] * self.width + self.start[1]] = START_COLOR
+        cells[self.goal[0] * self.width + self.goal[1]] = GOAL_COLOR
+
+        img = Image.frombytes("P", (self.width, self.height), bytes(cells))
+        img.putpalette([value for color in PALETTE for value in color])
+        img = img.resize((self.width * cell_size, self.height * cell_size), Image.NEAREST)
+
+        # Each cell keeps cell_border black pixels on its top and left edges
+        # and cell_border - 1 on its bottom and right edges
+        draw = ImageDraw.Draw(img)
+        if cell_border > 0:
+            for i in range(self.height + 1):
+                y = i * cell_size
+                draw.rectangle([(0, y - cell_border + 1), (img.width, y + cell_border - 1)],
+                               fill=BORDER_COLOR)
+            for j in range(self.width + 1):
+                x = j * cell_size
+                draw.rectangle([(x - cell_border + 1, 0), (x + cell_border - 1, img.height)],
+                               fill=BORDER_COLOR)
+
+        img.convert("RGBA").save(filename)
+
+
+class ExploredCells():
+    """
+    Read-only set of the (row, col) cells explored by Maze.solve_indexed,
+    backed by its per-cell marks instead of a set of tuples.
+    """
+    def __init__(self, maze, marks):
+        self.maze = maze
+        self.marks = marks
+
+    def __contains__(self, state):
+        row, col = state
+        if not (0 <= row < self.maze.height and 0 <= col < self.maze.width):
+            return False
+        return self.marks[self.maze.index(state)] == EXPLORED
 
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
+    def __len__(self):
+        return self.marks.count(EXPLORED)
 
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
+    def __iter__(self):
+        index = self.marks.find(EXPLORED)
+        while index != -1:
+            yield self.maze.state(index)
+            index = self.marks.find(EXPLORED, index + 1)
 
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
 
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
+STRATEGIES = ["dfs", "bfs", "greedy", "astar"]
 
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
 
-        img.save(filename)
+def main():
+    if len(sys.argv) not in [2, 3] or (len(sys.argv) == 3 and sys.argv[2] not in STRATEGIES):
+        sys.exit(f"Usage: python maze.py maze.txt [{'|'.join(STRATEGIES)}]")
+    strategy = sys.argv[2] if len(sys.argv) == 3 else "dfs"
 
+    m = Maze(sys.argv[1])
+    print("Maze:")
+    m.print()
+    print(f"Solving with {strategy}...")
+    m.solve_indexed(strategy)
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
 
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+if __name__ == "__main__":
+    main()
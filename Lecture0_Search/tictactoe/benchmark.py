@@ -0,0 +1,87 @@
+import sys
+import time
+
+import tictactoe_abp
+import tictactoe_bb
+from tictactoe_bb import FULL, WINS
+
+
+def full_tree_lists(board):
+    """
+    Searches the whole game tree below a list board without pruning, using
+    the list board functions of tictactoe_abp.
+
+    Returns (value, number of positions visited).
+    """
+    ttt = tictactoe_abp
+    if ttt.terminal(board):
+        return ttt.utility(board), 1
+    maximizing = ttt.player(board) == ttt.X
+    best = None
+    nodes = 1
+    for action in ttt.actions(board):
+        value, count = full_tree_lists(ttt.result(board, action))
+        nodes += count
+        if best is None or (value > best if maximizing else value < best):
+            best = value
+    return best, nodes
+
+
+def full_tree_bits(x, o, maximizing):
+    """
+    Searches the whole game tree below a pair of bitboards without pruning.
+
+    Returns (value, number of positions visited).
+    """
+    if WINS[x]:
+        return 1, 1
+    if WINS[o]:
+        return -1, 1
+    free = FULL & ~(x | o)
+    if not free:
+        return 0, 1
+    best = None
+    nodes = 1
+    while free:
+        bit = free & -free
+        free ^= bit
+        if maximizing:
+            value, count = full_tree_bits(x | bit, o, False)
+        else:
+            value, count = full_tree_bits(x, o | bit, True)
+        nodes += count
+        if best is None or (value > best if maximizing else value < best):
+            best = value
+    return best, nodes
+
+
+def timed(function, *args):
+    """Returns (return value, elapsed seconds) of one call."""
+    start = time.perf_counter()
+    value = function(*args)
+    return value, time.perf_counter() - start
+
+
+def main():
+    if len(sys.argv) != 1:
+        sys.exit("Usage: python benchmark.py")
+    board = tictactoe_abp.initial_state()
+
+    print("Full game tree from the empty board, no pruning:")
+    (value, nodes), elapsed = timed(full_tree_lists, board)
+    print(f"  lists     {nodes} positions in {elapsed:.3f}s, "
+          f"{nodes / elapsed:,.0f} positions/s, value {value}")
+    (value, nodes), elapsed = timed(full_tree_bits, 0, 0, True)
+    print(f"  bitboards {nodes} positions in {elapsed:.3f}s, "
+          f"{nodes / elapsed:,.0f} positions/s, value {value}")
+
+    print("First move with an empty transposition table:")
+    for name, engine in [("lists", tictactoe_abp), ("bitboards", tictactoe_bb)]:
+        engine.transposition_table.clear()
+        move, elapsed = timed(engine.minimax, board)
+        print(f"  {name:9} {engine.num_explored} positions in {elapsed:.4f}s, "
+              f"{engine.num_explored / elapsed:,.0f} positions/s, move {move}")
+
+
+if __name__ == "__main__":
+    main()
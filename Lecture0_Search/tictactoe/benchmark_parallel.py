@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+from mnk import MNK
+from parallel import ParallelSearch
+
+
+def benchmark_positions(game, openings):
+    """
+    Returns the boards reached by playing each opening on an empty board.
+    """
+    boards = []
+    for opening in openings:
+        board = game.initial_state()
+        for action in opening:
+            board = game.result(board, action)
+        boards.append(board)
+    return boards
+
+
+def run(workers, game, depth, boards):
+    """
+    Searches every board with a pool of `workers` processes.
+
+    Returns (moves chosen, elapsed seconds), not counting pool startup.
+    """
+    with ParallelSearch(workers, game, depth) as search:
+        # Start every worker before timing
+        search.minimax(boards[0])
+        start = time.perf_counter()
+        moves = [search.minimax(board) for board in boards]
+        return moves, time.perf_counter() - start
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark_parallel.py [max_workers] [depth]")
+    max_workers = int(sys.argv[1]) if len(sys.argv) >= 2 else os.cpu_count()
+    depth = int(sys.argv[2]) if len(sys.argv) == 3 else 6
+
+    game = MNK(6, 6, 4)
+    boards = benchmark_positions(game, [
+        [],
+        [(2, 2)],
+        [(2, 2), (3, 3)],
+        [(2, 2), (2, 3), (3, 2)],
+        [(0, 0), (2, 2), (5, 5), (3, 3)],
+        [(2, 2), (3, 3), (2, 3), (2, 4), (3, 2)]
+    ])
+    print(f"{len(boards)} positions of the 6,6,4 game searched {depth} moves ahead "
+          f"on {os.cpu_count()} CPUs")
+
+    baseline = None
+    reference = None
+    workers = 1
+    while workers <= max_workers:
+        moves, elapsed = run(workers, game, depth, boards)
+        if baseline is None:
+            baseline = elapsed
+            reference = moves
+        elif moves != reference:
+            raise Exception(f"{workers} workers chose different moves")
+        print(f"  {workers:3} workers  {elapsed:8.3f}s  speed-up {baseline / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
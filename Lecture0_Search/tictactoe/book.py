@@ -0,0 +1,135 @@
+import os
+import sys
+
+import tictactoe_abp as ttt
+
+BOOK_FILE = "book.bin"
+
+# Each board has one byte at its board index: the best move as a cell
+# number i * 3 + j (or NO_MOVE once the game is over) in the low 4 bits,
+# and the minimax value + 1 above them. Unreachable boards hold UNREACHABLE
+NO_MOVE = 9
+UNREACHABLE = 0xFF
+SIZE = 3 ** 9
+
+DIGITS = {ttt.EMPTY: 0, ttt.X: 1, ttt.O: 2}
+
+
+def board_index(board):
+    """
+    Returns the board read as a base-3 number, one digit per cell.
+    """
+    index = 0
+    for row in board:
+        for cell in row:
+            index = index * 3 + DIGITS[cell]
+    return index
+
+
+def positions():
+    """
+    Returns every board reachable from the initial state, by board index.
+    """
+    boards = dict()
+    stack = [ttt.initial_state()]
+    while stack:
+        board = stack.pop()
+        index = board_index(board)
+        if index in boards:
+            continue
+        boards[index] = board
+        if not ttt.terminal(board):
+            for action in ttt.actions(board):
+                stack.append(ttt.result(board, action))
+    return boards
+
+
+def solve(boards):
+    """
+    Returns the exact minimax value of every board, by board index,
+    from a full search of the game tree without pruning.
+    """
+    values = dict()
+
+    def value(board):
+        index = board_index(board)
+        if index not in values:
+            if ttt.terminal(board):
+                values[index] = ttt.utility(board)
+            else:
+                children = [value(ttt.result(board, action)) for action in ttt.actions(board)]
+                values[index] = max(children) if ttt.player(board) == ttt.X else min(children)
+        return values[index]
+
+    for board in boards.values():
+        value(board)
+    return values
+
+
+def build_book(engine=ttt):
+    """
+    Asks `engine` for its move in every reachable position and returns the
+    book as bytes.
+
+    Every move is checked against an exact solution of the game, so building
+    the book also tests the engine: raises an Exception for any move that
+    is not optimal.
+    """
+    boards = positions()
+    values = solve(boards)
+
+    book = bytearray([UNREACHABLE]) * SIZE
+    for index, board in boards.items():
+        if ttt.terminal(board):
+            book[index] = NO_MOVE | (values[index] + 1) << 4
+            continue
+        move = engine.minimax(board)
+        if values[board_index(ttt.result(board, move))] != values[index]:
+            raise Exception(f"engine move {move} is not optimal for board {board}")
+        book[index] = move[0] * 3 + move[1] | (values[index] + 1) << 4
+    return bytes(book)
+
+
+def load_book(filename=BOOK_FILE):
+    """
+    Returns the book stored in `filename`, building and saving it first if
+    the file does not exist yet.
+    """
+    if not os.path.exists(filename):
+        book = build_book()
+        with open(filename, "wb") as f:
+            f.write(book)
+        return book
+    with open(filename, "rb") as f:
+        book = f.read()
+    if len(book) != SIZE:
+        raise Exception(f"{filename} is not an opening book")
+    return book
+
+
+def lookup(book, board):
+    """
+    Returns (action, value) for a board, where action is None if the game is
+    over, or None if the board cannot be reached in a game.
+    """
+    entry = book[board_index(board)]
+    if entry == UNREACHABLE:
+        return None
+    cell = entry & 0xF
+    action = None if cell == NO_MOVE else divmod(cell, 3)
+    return action, (entry >> 4) - 1
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [book.bin]")
+    filename = sys.argv[1] if len(sys.argv) == 2 else BOOK_FILE
+    book = build_book()
+    with open(filename, "wb") as f:
+        f.write(book)
+    reachable = len(book) - book.count(UNREACHABLE)
+    print(f"Wrote {reachable} positions to {filename}, all engine moves optimal.")
+
+
+if __name__ == "__main__":
+    main()
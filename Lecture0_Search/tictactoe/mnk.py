@@ -0,0 +1,343 @@
+"""
+m,n,k Game Player
+
+Tic-tac-toe generalized to an m x n board where k in a row wins, e.g.
+MNK(3, 3, 3) for tic-tac-toe, MNK(4, 4, 3) or MNK(15, 15, 5) for gomoku.
+Boards are lists of rows of X, O and EMPTY, as in tictactoe_abp.
+
+Full minimax is only feasible on tiny boards, so minimax runs an
+iterative-deepening alpha-beta search within a time budget and scores the
+positions where it stops with a heuristic evaluation.
+"""
+
+import math
+import sys
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Search score of a win, less the number of moves it takes
+WIN = 10 ** 9
+
+# Boards with more cells than this only consider moves next to a stone
+NEAR_CELLS = 25
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class MNK():
+    def __init__(self, m=3, n=3, k=3):
+        if k > max(m, n):
+            raise Exception("k must fit on the board")
+        self.m = m
+        self.n = n
+        self.k = k
+
+        # Every line of k cells that could win, as lists of cell indices,
+        # and the lines through each cell. Cell (i, j) has index i * n + j
+        self.windows = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                    if 0 <= i + di * (k - 1) < m and 0 <= j + dj * (k - 1) < n:
+                        self.windows.append([(i + di * d) * n + j + dj * d for d in range(k)])
+        self.cell_windows = [[] for _ in range(m * n)]
+        for w, window in enumerate(self.windows):
+            for cell in window:
+                self.cell_windows[cell].append(w)
+
+        # Cells next to each cell, for move generation on large boards
+        self.neighbors = []
+        for i in range(m):
+            for j in range(n):
+                self.neighbors.append([(i + di) * n + j + dj
+                                       for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                                       if (di or dj) and 0 <= i + di < m and 0 <= j + dj < n])
+
+        # Heuristic value of a window holding x stones of X and o stones of O:
+        # a window only counts for a player who can still complete it
+        weights = [0] + [4 ** count for count in range(1, k)] + [WIN]
+        self.values = [[0 if x and o else weights[x] - weights[o] for o in range(k + 1)]
+                       for x in range(k + 1)]
+
+        # Depth reached and positions visited by the most recent minimax
+        self.depth = 0
+        self.num_explored = 0
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board, as "X" or "O"
+        """
+        moves_x = sum(row.count(X) for row in board)
+        moves_o = sum(row.count(O) for row in board)
+        if moves_x == moves_o:
+            return X
+        elif moves_x == moves_o + 1:
+            return O
+        raise Exception("Invalid board state!")
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i, row in enumerate(board)
+                for j, cell in enumerate(row) if cell is EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if board[i][j] is not EMPTY:
+            raise Exception("Invalid action!")
+        newboard = [row[:] for row in board]
+        newboard[i][j] = self.player(board)
+        return newboard
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        cells = [cell for row in board for cell in row]
+        for window in self.windows:
+            first = cells[window[0]]
+            if first is not EMPTY and all(cells[cell] == first for cell in window):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.winner(board) is not None or all(EMPTY not in row for row in board)
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        gameresult = self.winner(board)
+        if gameresult == X:
+            return 1
+        elif gameresult == O:
+            return -1
+        return 0
+
+    def minimax(self, board, time_limit=1.0, max_depth=None):
+        """
+        Returns the best action found for the current player on the board
+        within `time_limit` seconds, searching at most `max_depth` moves ahead.
+
+        Assumes that the game is not over yet
+        """
+        search = Search(self, board, time.perf_counter() + time_limit)
+        self.depth = 0
+        moves = search.ordered_moves(None)
+        best = moves[0]
+        empty = search.cells.count(EMPTY)
+        depth_limit = empty if max_depth is None else min(max_depth, empty)
+
+        for depth in range(1, depth_limit + 1):
+            try:
+                value, best = search.root(depth, [best] + [move for move in moves if move != best])
+            except SearchTimeout:
+                # Keep a move from the unfinished depth only if it was
+                # compared against the previous best move
+                if search.root_best is not None:
+                    best = search.root_best
+                break
+            self.depth = depth
+            if abs(value) > WIN // 2:
+                break
+
+        self.num_explored = search.nodes
+        return divmod(best, self.n)
+
+
+class Search():
+    """
+    One alpha-beta search of a position, played out on a flat list of cells
+    with the number of stones of each player in every window kept up to date,
+    so that moves, wins and the evaluation are all updated incrementally.
+    """
+
+    def __init__(self, game, board, deadline):
+        self.game = game
+        self.deadline = deadline
+        self.nodes = 0
+        self.root_best = None
+
+        self.cells = [cell for row in board for cell in row]
+        self.counts = {X: [0] * len(game.windows), O: [0] * len(game.windows)}
+        self.score = 0
+        self.stones = []
+        for index, cell in enumerate(self.cells):
+            if cell is not EMPTY:
+                self.make(index, cell)
+        self.turn = game.player(board)
+
+    def make(self, index, player=None):
+        """
+        Places a stone for `player` (by default the player to move) and
+        returns True if it completes a window.
+        """
+        game = self.game
+        player = player or self.turn
+        counts = self.counts[player]
+        x = self.counts[X]
+        o = self.counts[O]
+        won = False
+        for w in game.cell_windows[index]:
+            self.score -= game.values[x[w]][o[w]]
+            counts[w] += 1
+            self.score += game.values[x[w]][o[w]]
+            if counts[w] == game.k:
+                won = True
+        self.cells[index] = player
+        self.stones.append(index)
+        self.turn = O if player == X else X
+        return won
+
+    def unmake(self):
+        """
+        Takes back the most recent stone.
+        """
+        game = self.game
+        index = self.stones.pop()
+        player = self.cells[index]
+        counts = self.counts[player]
+        x = self.counts[X]
+        o = self.counts[O]
+        for w in game.cell_windows[index]:
+            self.score -= game.values[x[w]][o[w]]
+            counts[w] -= 1
+            self.score += game.values[x[w]][o[w]]
+        self.cells[index] = EMPTY
+        self.turn = player
+
+    def evaluate(self):
+        """
+        Returns the heuristic value of the position for the player to move.
+        """
+        return self.score if self.turn == X else -self.score
+
+    def ordered_moves(self, first):
+        """
+        Returns the cells worth playing, most promising first: `first`, then
+        cells that most improve the windows through them for either player.
+        """
+        game = self.game
+        cells = self.cells
+        if len(cells) > NEAR_CELLS and self.stones:
+            moves = {neighbor for stone in self.stones for neighbor in game.neighbors[stone]
+                     if cells[neighbor] is EMPTY}
+        else:
+            moves = [index for index, cell in enumerate(cells) if cell is EMPTY]
+        if not moves:
+            moves = [index for index, cell in enumerate(cells) if cell is EMPTY]
+        if not self.stones and len(cells) > NEAR_CELLS:
+            moves = [(game.m // 2) * game.n + game.n // 2]
+
+        x = self.counts[X]
+        o = self.counts[O]
+        values = game.values
+
+        def priority(index):
+            if index == first:
+                return math.inf
+            gain = 0
+            for w in game.cell_windows[index]:
+                current = values[x[w]][o[w]]
+                gain += abs(values[x[w] + 1][o[w]] - current)
+                gain += abs(values[x[w]][o[w] + 1] - current)
+            return gain
+
+        return sorted(moves, key=lambda index: (-priority(index), index))
+
+    def root(self, depth, moves):
+        """
+        Searches every root move to `depth` moves ahead.
+
+        Returns (value, best move) for the player to move.
+        """
+        self.root_best = None
+        alpha = -math.inf
+        for move in moves:
+            if self.make(move):
+                value = WIN - 1
+            else:
+                value = -self.negamax(depth - 1, -math.inf, -alpha, 1)
+            self.unmake()
+            if self.root_best is None or value > alpha:
+                alpha = value
+                self.root_best = move
+        return alpha, self.root_best
+
+    def negamax(self, depth, alpha, beta, ply):
+        """
+        Returns the value of the position for the player to move, searching
+        `depth` moves ahead and scoring the positions there heuristically.
+        """
+        self.nodes += 1
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        if len(self.stones) == len(self.cells):
+            return 0
+        if depth == 0:
+            return self.evaluate()
+
+        moves = self.ordered_moves(None)
+
+        best = -math.inf
+        for move in moves:
+            if self.make(move):
+                # Winning sooner is better than winning later
+                value = WIN - ply - 1
+            else:
+                value = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            self.unmake()
+            if value > best:
+                best = value
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+        return best
+
+
+def print_board(board):
+    for row in board:
+        print(" ".join(cell or "." for cell in row))
+    print()
+
+
+def main():
+    if len(sys.argv) not in [4, 5]:
+        sys.exit("Usage: python mnk.py m n k [seconds per move]")
+    game = MNK(int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]))
+    time_limit = float(sys.argv[4]) if len(sys.argv) == 5 else 1.0
+
+    # Let the computer play both sides
+    board = game.initial_state()
+    while not game.terminal(board):
+        move = game.minimax(board, time_limit)
+        print(f"{game.player(board)} plays {move} "
+              f"(depth {game.depth}, {game.num_explored} positions)")
+        board = game.result(board, move)
+        print_board(board)
+
+    gameresult = game.winner(board)
+    print("Game Over: Tie." if gameresult is None else f"Game Over: {gameresult} wins.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Root-parallel alpha-beta search
+
+Splits the moves at the root of the search across a pool of processes.
+Every worker searches one root move at a time with the best value found so
+far as its alpha bound, read from a value shared by all workers, so that
+moves searched later are cut off as they would be in a sequential search.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Value
+
+import tictactoe_abp as ttt
+from mnk import WIN, Search
+
+# Best value found so far for the player at the root, shared with workers
+best_bound = None
+
+
+def init_worker(bound):
+    global best_bound
+    best_bound = bound
+
+
+def search_move(board, action, bound, game=None, depth=None):
+    """
+    Returns the value for the player at the root of playing `action`,
+    searched with `bound` as the best value already known for that player.
+
+    Uses tictactoe_abp if `game` is None, or else searches the mnk game
+    `game` to `depth` moves ahead.
+    """
+    if game is None:
+        if ttt.player(board) == ttt.X:
+            return ttt.min_value(ttt.result(board, action), bound, math.inf)
+        return -ttt.max_value(ttt.result(board, action), -math.inf, -bound)
+
+    search = Search(game, board, math.inf)
+    if search.make(action[0] * game.n + action[1]):
+        return WIN - 1
+    return -search.negamax(depth - 1, -math.inf, -bound, 1)
+
+
+def run_move(board, action, game, depth):
+    """
+    Searches one root move in a worker with the shared bound.
+
+    Returns (value, bound used). The value is exact if it is greater than the
+    bound used, and otherwise only an upper bound on the true value.
+    """
+    bound = best_bound.value
+    value = search_move(board, action, bound, game, depth)
+    with best_bound.get_lock():
+        if value > best_bound.value:
+            best_bound.value = value
+    return value, bound
+
+
+class ParallelSearch():
+    """
+    Pool of worker processes that search the root moves of a position.
+
+    Searches tictactoe_abp positions by default, or positions of the mnk
+    game `game` to a fixed `depth`.
+    """
+
+    def __init__(self, workers=None, game=None, depth=None):
+        if game is not None and depth is None:
+            raise Exception("mnk searches need a depth")
+        self.game = game
+        self.depth = depth
+        self.bound = Value("d", -math.inf)
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                            initargs=(self.bound,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+
+    def root_actions(self, board):
+        """
+        Returns the root moves in the order they are handed out, most
+        promising first so that the shared bound rises early.
+        """
+        if self.game is None:
+            return sorted(ttt.actions(board))
+        moves = Search(self.game, board, math.inf).ordered_moves(None)
+        return [divmod(move, self.game.n) for move in moves]
+
+    def minimax(self, board):
+        """
+        Returns the optimal action for the current player on the board.
+
+        The result does not depend on the order in which workers finish:
+        the first root move whose value is the best value is chosen, and
+        moves whose value is only a bound are searched again to settle ties.
+
+        Assumes that the game is not over yet
+        """
+        actions = self.root_actions(board)
+        self.bound.value = -math.inf
+        futures = [self.executor.submit(run_move, board, action, self.game, self.depth)
+                   for action in actions]
+        results = [future.result() for future in futures]
+
+        best = max(value for value, bound in results)
+        for action, (value, bound) in zip(actions, results):
+            if value < best:
+                continue
+            if value > bound:
+                return action
+            # Only an upper bound equal to the best value: the true value
+            # may be lower, so find out before choosing this move
+            if search_move(board, action, -math.inf, self.game, self.depth) == best:
+                return action
+        raise Exception("no exact best value")
@@ -1,8 +1,16 @@
+import argparse
+import json
 import pygame
 import sys
 import time
 
 import tictactoe as ttt
+from util import SearchStats
+
+parser = argparse.ArgumentParser(description="Play tic-tac-toe against the computer.")
+parser.add_argument("--stats", action="store_true",
+                    help="print statistics on each computer search as JSON")
+args = parser.parse_args()
 
 pygame.init()
 size = width, height = 600, 400
@@ -112,7 +120,12 @@ while True:
         if user != player and not game_over:
             if ai_turn:
                 time.sleep(0.5)
-                move = ttt.minimax(board)
+                if args.stats:
+                    stats = SearchStats()
+                    move = ttt.minimax(board, stats)
+                    print(json.dumps(stats.as_dict()))
+                else:
+                    move = ttt.minimax(board)
                 board = ttt.result(board, move)
                 ai_turn = False
             else:
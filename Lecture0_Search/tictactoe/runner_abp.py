@@ -1,8 +1,17 @@
+import argparse
+import json
 import pygame
 import sys
 import time
 
 import tictactoe_abp as ttt
+from book import load_book, lookup
+from util import SearchStats
+
+parser = argparse.ArgumentParser(description="Play tic-tac-toe against the computer.")
+parser.add_argument("--stats", action="store_true",
+                    help="print statistics on each computer search as JSON, skipping the move book")
+args = parser.parse_args()
 
 pygame.init()
 size = width, height = 600, 400
@@ -17,6 +26,9 @@ mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
+# Best moves for every reachable board, built on first run
+book = load_book()
+
 user = None
 board = ttt.initial_state()
 ai_turn = False
@@ -112,7 +124,17 @@ while True:
         if user != player and not game_over:
             if ai_turn:
                 time.sleep(0.5)
-                move = ttt.minimax(board)
+                entry = None if args.stats else lookup(book, board)
+                if entry is not None:
+                    move = entry[0]
+                elif args.stats:
+                    stats = SearchStats()
+                    move = ttt.minimax(board, stats)
+                    print(json.dumps(stats.as_dict()))
+                else:
+                    move = ttt.minimax(board)
+                    print(f"Explored {ttt.num_explored} positions, "
+                          f"{len(ttt.transposition_table)} in transposition table")
                 board = ttt.result(board, move)
                 ai_turn = False
             else:
@@ -172,51 +172,71 @@ def utility(board):
     #raise NotImplementedError
 
 
-def min_value(board):
-    if terminal(board):
-        return utility(board)
-    v = math.inf
-   # print("Min",actions(board))
-    for action in actions(board):
-    #   print("MIN current",board)
-    #   print(action)
-        v = min(v, max_value(result(board,action)))
-    #  print(v)
-    return v
-
-def max_value(board):
-    if terminal(board):
-        return utility(board)
-    v = -math.inf
-    #print("Max",actions(board))
-    for action in actions(board):
-    #   print("MAX current",board)
-    #   print(action)
-        v = max(v, min_value(result(board,action)))
-    #   print(v)
-    return v
-
-
-def minimax(board):
+def min_value(board, stats=None):
+    if stats is not None:
+        stats.enter()
+    try:
+        if terminal(board):
+            return utility(board)
+        v = math.inf
+        moves = actions(board)
+        if stats is not None:
+            stats.expand(len(moves))
+        for action in moves:
+            v = min(v, max_value(result(board,action), stats))
+        return v
+    finally:
+        if stats is not None:
+            stats.leave()
+
+def max_value(board, stats=None):
+    if stats is not None:
+        stats.enter()
+    try:
+        if terminal(board):
+            return utility(board)
+        v = -math.inf
+        moves = actions(board)
+        if stats is not None:
+            stats.expand(len(moves))
+        for action in moves:
+            v = max(v, min_value(result(board,action), stats))
+        return v
+    finally:
+        if stats is not None:
+            stats.leave()
+
+
+def minimax(board, stats=None):
     """
     Returns the optimal action for the current player on the board.
     If AI Plays "X", use max_value, if AI plays "O", use min_value
     
     Assumes that the game is not over yet
+
+    Pass a util.SearchStats as `stats` to collect statistics on the search.
     """
     decisionset = dict()
     
     #frontier = StackFrontier()
     #frontier.add(board)
+
+    moves = actions(board)
+    if stats is not None:
+        stats.enter()
+        stats.expand(len(moves))
     
     if player(board)=="X":
-        for action in actions(board):
-            decisionset[action] = min_value(result(board, action))
+        for action in moves:
+            decisionset[action] = min_value(result(board, action), stats)
         action = max(zip(decisionset.values(), decisionset.keys()))[1]
     else:
-        for action in actions(board):
-            decisionset[action] = max_value(result(board, action))
+        for action in moves:
+            decisionset[action] = max_value(result(board, action), stats)
         action = min(zip(decisionset.values(), decisionset.keys()))[1]
+
+    if stats is not None:
+        stats.leave()
     return action
 
     #raise NotImplementedError
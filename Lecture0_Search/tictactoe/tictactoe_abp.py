@@ -10,6 +10,18 @@ X = "X"
 O = "O"
 EMPTY = None
 
+# Kinds of value stored in the transposition table: the exact minimax value,
+# or a bound on it left by an alpha-beta cutoff
+EXACT = 0
+LOWERBOUND = 1
+UPPERBOUND = 2
+
+# Maps canonical board keys to (value, bound kind), kept between searches
+transposition_table = dict()
+
+# Number of positions visited by the most recent call to minimax
+num_explored = 0
+
 
 def initial_state():
     """
@@ -169,79 +181,170 @@ def utility(board):
     #raise NotImplementedError
 
 
-def min_value(board,alpha,beta):
+def min_value(board,alpha,beta,stats=None):
     """
     Alpha-beta pruning: for min_value function, stop exploring if there is a 
     utility < alpha (current max for max player)
 
+    Values already known from the transposition table are reused instead of
+    searching the same position again.
     """
-    if terminal(board):
-        return utility(board)
-    v = math.inf
-   # print("Min",actions(board))
-    for action in actions(board):
-    #   print("MIN current",board)
-    #   print(action)
-        
-        v = min(v, max_value(result(board,action),alpha,beta))
-        if v < alpha:
-            return v
-        if v < beta:
-            beta = v
-    #  print(v)
-    return v
-
-def max_value(board,alpha,beta):
+    global num_explored
+    num_explored += 1
+    if stats is not None:
+        stats.enter()
+    try:
+        if terminal(board):
+            return utility(board)
+
+        key = board_key(board)
+        entry = lookup(key, alpha, beta)
+        if entry is not None:
+            if stats is not None:
+                stats.table_hit()
+            return entry
+
+        alpha0, beta0 = alpha, beta
+        v = math.inf
+        moves = actions(board)
+        if stats is not None:
+            stats.expand(len(moves))
+        for action in moves:
+            v = min(v, max_value(result(board,action),alpha,beta,stats))
+            if v < alpha:
+                if stats is not None:
+                    stats.cutoff()
+                break
+            if v < beta:
+                beta = v
+        store(key, v, alpha0, beta0)
+        return v
+    finally:
+        if stats is not None:
+            stats.leave()
+
+def max_value(board,alpha,beta,stats=None):
     """
     Alpha-beta pruning: for max_value function, stop exploring if there is a 
     utility > beta (current min for min player)
 
+    Values already known from the transposition table are reused instead of
+    searching the same position again.
     """
-    if terminal(board):
-        return utility(board)
-    v = -math.inf
-    #print("Max",actions(board))
-    for action in actions(board):
-    #   print("MAX current",board)
-    #   print(action)
-        
-        v = max(v, min_value(result(board,action),alpha,beta))
-        if v > beta:
-            return v
-        if v > alpha:
-            alpha = v
-    #   print(v)
-    return v
+    global num_explored
+    num_explored += 1
+    if stats is not None:
+        stats.enter()
+    try:
+        if terminal(board):
+            return utility(board)
+
+        key = board_key(board)
+        entry = lookup(key, alpha, beta)
+        if entry is not None:
+            if stats is not None:
+                stats.table_hit()
+            return entry
+
+        alpha0, beta0 = alpha, beta
+        v = -math.inf
+        moves = actions(board)
+        if stats is not None:
+            stats.expand(len(moves))
+        for action in moves:
+            v = max(v, min_value(result(board,action),alpha,beta,stats))
+            if v > beta:
+                if stats is not None:
+                    stats.cutoff()
+                break
+            if v > alpha:
+                alpha = v
+        store(key, v, alpha0, beta0)
+        return v
+    finally:
+        if stats is not None:
+            stats.leave()
+
+
+def lookup(key, alpha, beta):
+    """
+    Returns the stored value of a position if it settles the search within
+    the window (alpha, beta), otherwise None. A bound only settles the
+    search if it would have caused a cutoff.
+    """
+    entry = transposition_table.get(key)
+    if entry is None:
+        return None
+    value, bound = entry
+    if bound == EXACT:
+        return value
+    if bound == LOWERBOUND and value > beta:
+        return value
+    if bound == UPPERBOUND and value < alpha:
+        return value
+    return None
+
+
+def store(key, value, alpha, beta):
+    """
+    Stores the value of a position searched with the window (alpha, beta).
+    A value outside the window only bounds the true value, because the
+    search was cut off. Searches only cut off on values strictly outside
+    the window, so a value equal to alpha or beta is still exact.
+    """
+    if value < alpha:
+        bound = UPPERBOUND
+    elif value > beta:
+        bound = LOWERBOUND
+    else:
+        bound = EXACT
 
+    # Never replace an exact value with a bound
+    entry = transposition_table.get(key)
+    if entry is None or entry[1] != EXACT:
+        transposition_table[key] = (value, bound)
 
-def minimax(board):
+
+def minimax(board, stats=None):
     """
     Returns the optimal action for the current player on the board.
     If AI Plays "X", use max_value, if AI plays "O", use min_value
     
     Assumes that the game is not over yet
+
+    Pass a util.SearchStats as `stats` to collect statistics on the search.
     """
+    global num_explored
+    num_explored = 0
     decisionset = dict()
     
     #frontier = StackFrontier()
     #frontier.add(board)
     alpha = -math.inf       # store max for max player "X"
     beta = math.inf        # store min for min player "O"  
+
+    moves = actions(board)
+    if stats is not None:
+        stats.enter()
+        stats.expand(len(moves))
     
     if player(board)=="X":
-        for action in actions(board):
-            currentv = min_value(result(board, action),alpha,beta)
+        for action in moves:
+            currentv = min_value(result(board, action),alpha,beta,stats)
             if currentv > alpha:
                 alpha = currentv
             decisionset[action] = currentv
         action = max(zip(decisionset.values(), decisionset.keys()))[1]
     else:
-        for action in actions(board):
-            currentv = max_value(result(board, action),alpha,beta)
+        for action in moves:
+            currentv = max_value(result(board, action),alpha,beta,stats)
             if currentv < beta:
                 beta = currentv
             decisionset[action] = currentv
         action = min(zip(decisionset.values(), decisionset.keys()))[1]
+
+    if stats is not None:
+        stats.leave()
     return action
 
     #raise NotImplementedError
@@ -259,4 +362,31 @@ def get_position(board,player):
             if l2 == player:
                 boardpos.append((row,col)) 
     return boardpos
-             
\ No newline at end of file
+
+
+def symmetries():
+    """
+    Returns the 8 rotations and reflections of the board, each as a tuple
+    giving the original cell for every cell of the transformed board.
+    """
+    cells = [(i, j) for i in range(3) for j in range(3)]
+    result = []
+    transform = cells
+    for _ in range(4):
+        # Rotate a quarter turn, then add the rotation and its mirror image
+        transform = [transform[(2 - j) * 3 + i] for i, j in cells]
+        result.append(tuple(i * 3 + j for i, j in transform))
+        result.append(tuple(i * 3 + (2 - j) for i, j in transform))
+    return result
+
+
+SYMMETRIES = symmetries()
+
+
+def board_key(board):
+    """
+    Returns a key shared by all boards that are rotations or reflections of
+    each other: the smallest of the 8 transformed boards as a string.
+    """
+    cells = [cell or "-" for row in board for cell in row]
+    return min("".join([cells[i] for i in symmetry]) for symmetry in SYMMETRIES)
@@ -0,0 +1,292 @@
+"""
+Tic Tac Toe Player on bitboards
+
+Same interface as tictactoe_abp, taking and returning list boards, but every
+position is searched as two 9-bit integers: one for the cells held by X and
+one for the cells held by O. Cell (i, j) is bit i * 3 + j.
+"""
+
+import math
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Every cell of the board, in bit order
+CELLS = [(i, j) for i in range(3) for j in range(3)]
+FULL = (1 << 9) - 1
+
+# Three in a row, as bit masks
+WIN_MASKS = [0b000000111, 0b000111000, 0b111000000,
+             0b001001001, 0b010010010, 0b100100100,
+             0b100010001, 0b001010100]
+
+# WINS[bits] is 1 if the cells in bits contain three in a row
+WINS = bytes(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(1 << 9))
+
+# Kinds of value stored in the transposition table
+EXACT = 0
+LOWERBOUND = 1
+UPPERBOUND = 2
+
+# Maps x << 9 | o to (value, bound kind), kept between searches
+transposition_table = dict()
+
+# Number of positions visited by the most recent call to minimax
+num_explored = 0
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+    return [[EMPTY, EMPTY, EMPTY],
+            [EMPTY, EMPTY, EMPTY],
+            [EMPTY, EMPTY, EMPTY]]
+
+
+def to_bits(board):
+    """
+    Returns (x, o), the bitboards of the cells held by each player.
+    """
+    x = 0
+    o = 0
+    for n, (i, j) in enumerate(CELLS):
+        if board[i][j] == X:
+            x |= 1 << n
+        elif board[i][j] == O:
+            o |= 1 << n
+    return x, o
+
+
+def to_board(x, o):
+    """
+    Returns the list board for a pair of bitboards.
+    """
+    return [[X if x >> (i * 3 + j) & 1 else O if o >> (i * 3 + j) & 1 else EMPTY
+             for j in range(3)]
+            for i in range(3)]
+
+
+def bits_player(x, o):
+    """
+    Returns the player who moves next on a pair of bitboards.
+    """
+    moves_x = x.bit_count()
+    moves_o = o.bit_count()
+    if moves_x == moves_o:
+        return X
+    elif moves_x == moves_o + 1:
+        return O
+    raise Exception("Invalid board state!")
+
+
+def bits_winner(x, o):
+    """
+    Returns the winner on a pair of bitboards, if there is one.
+    """
+    if WINS[x]:
+        return X
+    elif WINS[o]:
+        return O
+    return None
+
+
+def bits_terminal(x, o):
+    """
+    Returns True if the game is over on a pair of bitboards.
+    """
+    return x | o == FULL or WINS[x] or WINS[o]
+
+
+def bits_utility(x, o):
+    """
+    Returns 1 if X has won, -1 if O has won, 0 otherwise.
+    """
+    if WINS[x]:
+        return 1
+    elif WINS[o]:
+        return -1
+    return 0
+
+
+def player(board):
+    """
+    Returns player who has the next turn on a board, as "X" or "O"
+    """
+    return bits_player(*to_bits(board))
+
+
+def actions(board):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    x, o = to_bits(board)
+    free = FULL & ~(x | o)
+    return {CELLS[n] for n in range(9) if free >> n & 1}
+
+
+def result(board, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    x, o = to_bits(board)
+    bit = 1 << (action[0] * 3 + action[1])
+    if (x | o) & bit:
+        raise Exception("Invalid action!")
+    if bits_player(x, o) == X:
+        return to_board(x | bit, o)
+    return to_board(x, o | bit)
+
+
+def winner(board):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    return bits_winner(*to_bits(board))
+
+
+def terminal(board):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return bool(bits_terminal(*to_bits(board)))
+
+
+def utility(board):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    return bits_utility(*to_bits(board))
+
+
+def max_value(x, o, alpha, beta):
+    """
+    Alpha-beta search for X to move, stopping if there is a utility > beta.
+    """
+    global num_explored
+    num_explored += 1
+    if WINS[x]:
+        return 1
+    if WINS[o]:
+        return -1
+    free = FULL & ~(x | o)
+    if not free:
+        return 0
+
+    key = x << 9 | o
+    entry = lookup(key, alpha, beta)
+    if entry is not None:
+        return entry
+
+    alpha0, beta0 = alpha, beta
+    v = -math.inf
+    while free:
+        bit = free & -free
+        free ^= bit
+        v = max(v, min_value(x | bit, o, alpha, beta))
+        if v > beta:
+            break
+        if v > alpha:
+            alpha = v
+    store(key, v, alpha0, beta0)
+    return v
+
+
+def min_value(x, o, alpha, beta):
+    """
+    Alpha-beta search for O to move, stopping if there is a utility < alpha.
+    """
+    global num_explored
+    num_explored += 1
+    if WINS[x]:
+        return 1
+    if WINS[o]:
+        return -1
+    free = FULL & ~(x | o)
+    if not free:
+        return 0
+
+    key = x << 9 | o
+    entry = lookup(key, alpha, beta)
+    if entry is not None:
+        return entry
+
+    alpha0, beta0 = alpha, beta
+    v = math.inf
+    while free:
+        bit = free & -free
+        free ^= bit
+        v = min(v, max_value(x, o | bit, alpha, beta))
+        if v < alpha:
+            break
+        if v < beta:
+            beta = v
+    store(key, v, alpha0, beta0)
+    return v
+
+
+def lookup(key, alpha, beta):
+    """
+    Returns the stored value of a position if it settles the search within
+    the window (alpha, beta), otherwise None.
+    """
+    entry = transposition_table.get(key)
+    if entry is None:
+        return None
+    value, bound = entry
+    if bound == EXACT:
+        return value
+    if bound == LOWERBOUND and value > beta:
+        return value
+    if bound == UPPERBOUND and value < alpha:
+        return value
+    return None
+
+
+def store(key, value, alpha, beta):
+    """
+    Stores the value of a position searched with the window (alpha, beta).
+    """
+    if value < alpha:
+        bound = UPPERBOUND
+    elif value > beta:
+        bound = LOWERBOUND
+    else:
+        bound = EXACT
+    entry = transposition_table.get(key)
+    if entry is None or entry[1] != EXACT:
+        transposition_table[key] = (value, bound)
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+
+    Assumes that the game is not over yet
+    """
+    global num_explored
+    num_explored = 0
+    x, o = to_bits(board)
+    free = FULL & ~(x | o)
+
+    alpha = -math.inf
+    beta = math.inf
+    best = None
+    if bits_player(x, o) == X:
+        while free:
+            bit = free & -free
+            free ^= bit
+            v = min_value(x | bit, o, alpha, beta)
+            if best is None or v > alpha:
+                alpha = v
+                best = bit
+    else:
+        while free:
+            bit = free & -free
+            free ^= bit
+            v = max_value(x, o | bit, alpha, beta)
+            if best is None or v < beta:
+                beta = v
+                best = bit
+    return CELLS[best.bit_length() - 1]
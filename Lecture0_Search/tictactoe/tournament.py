@@ -0,0 +1,166 @@
+import argparse
+import itertools
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import tictactoe
+import tictactoe_abp as ttt
+import tictactoe_bb
+from util import SearchStats
+
+
+def plain_engine(board, rng):
+    stats = SearchStats()
+    move = tictactoe.minimax(board, stats)
+    # Leave out the root, which num_explored does not count either
+    return move, stats.as_dict()["nodes"] - 1
+
+
+def abp_engine(board, rng):
+    move = ttt.minimax(board)
+    return move, ttt.num_explored
+
+
+def bitboard_engine(board, rng):
+    move = tictactoe_bb.minimax(board)
+    return move, tictactoe_bb.num_explored
+
+
+def random_engine(board, rng):
+    return rng.choice(sorted(ttt.actions(board))), 0
+
+
+# Each engine takes a board and a random.Random and returns
+# (move, number of positions searched)
+ENGINES = {
+    "plain": plain_engine,
+    "abp": abp_engine,
+    "bitboard": bitboard_engine,
+    "random": random_engine
+}
+
+
+def play_game(x, o, seed, opening):
+    """
+    Plays one game between the engines named `x` and `o`, after `opening`
+    random moves chosen with `seed`.
+
+    Returns the winner ("X", "O" or None) and, for each player, a list of
+    (seconds, positions searched) for every move its engine made.
+
+    Every game starts with empty transposition tables, so that its figures
+    do not depend on which games the same process played before.
+    """
+    ttt.transposition_table.clear()
+    tictactoe_bb.transposition_table.clear()
+    rng = random.Random(seed)
+    board = ttt.initial_state()
+    for _ in range(opening):
+        if ttt.terminal(board):
+            break
+        board = ttt.result(board, rng.choice(sorted(ttt.actions(board))))
+
+    moves = {ttt.X: [], ttt.O: []}
+    engines = {ttt.X: ENGINES[x], ttt.O: ENGINES[o]}
+    while not ttt.terminal(board):
+        player = ttt.player(board)
+        start = time.perf_counter()
+        move, nodes = engines[player](board, rng)
+        moves[player].append((time.perf_counter() - start, nodes))
+        board = ttt.result(board, move)
+    return ttt.winner(board), moves
+
+
+def play_match(args):
+    """Plays one scheduled game, for use with Executor.map."""
+    a, b, game, seed, opening = args
+    # Engines swap sides every game
+    x, o = (a, b) if game % 2 == 0 else (b, a)
+    winner, moves = play_game(x, o, seed, opening)
+    return a, b, x, winner, moves
+
+
+def schedule(engines, games, seed, opening):
+    """
+    Yields every game of a round robin between `engines`, `games` games per
+    pair, each with its own seed.
+    """
+    for a, b in itertools.combinations(engines, 2):
+        for game in range(games):
+            yield a, b, game, seed * 1000003 + game, opening
+
+
+def summarize(results):
+    """
+    Returns, for each pair of engines, wins, draws and losses of the first
+    engine and the average move latency and positions per move of each.
+    """
+    summary = dict()
+    for a, b, x, winner, moves in results:
+        pair = summary.setdefault(f"{a} vs {b}", {
+            "wins": 0, "draws": 0, "losses": 0,
+            "moves": {a: [0, 0.0, 0], b: [0, 0.0, 0]}
+        })
+        if winner is None:
+            pair["draws"] += 1
+        elif (winner == ttt.X) == (x == a):
+            pair["wins"] += 1
+        else:
+            pair["losses"] += 1
+
+        for player, engine in [(ttt.X, x), (ttt.O, b if x == a else a)]:
+            totals = pair["moves"][engine]
+            for seconds, nodes in moves[player]:
+                totals[0] += 1
+                totals[1] += seconds
+                totals[2] += nodes
+
+    for pair in summary.values():
+        for engine, (count, seconds, nodes) in pair["moves"].items():
+            pair["moves"][engine] = {
+                "moves": count,
+                "ms_per_move": seconds * 1000 / count if count else None,
+                "nodes_per_move": nodes / count if count else None
+            }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play tic-tac-toe engines against each other without a GUI."
+    )
+    parser.add_argument("engines", nargs="+", choices=list(ENGINES),
+                        help="engines to play in a round robin")
+    parser.add_argument("-n", "--games", type=int, default=100,
+                        help="games per pair of engines, alternating sides")
+    parser.add_argument("--opening", type=int, default=1,
+                        help="random moves played before the engines take over")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+    if len(set(args.engines)) != len(args.engines) or len(args.engines) < 2:
+        parser.error("expected at least two different engines")
+
+    games = list(schedule(args.engines, args.games, args.seed, args.opening))
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(play_match, games, chunksize=max(1, len(games) // 64)))
+    summary = summarize(results)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    for name, pair in summary.items():
+        print(f"{name}: {pair['wins']} wins, {pair['draws']} draws, {pair['losses']} losses")
+        for engine, moves in pair["moves"].items():
+            if moves["moves"]:
+                print(f"  {engine:10} {moves['moves']:7} moves  "
+                      f"{moves['ms_per_move']:9.3f} ms/move  "
+                      f"{moves['nodes_per_move']:10.1f} positions/move")
+
+
+if __name__ == "__main__":
+    main()
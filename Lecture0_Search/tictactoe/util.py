@@ -1,3 +1,7 @@
+import time
+from collections import deque
+
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -36,3 +40,123 @@ class QueueFrontier(StackFrontier):
             node = self.frontier[0]
             self.frontier = self.frontier[1:]
             return node
+
+
+class DequeStackFrontier():
+    """
+    Stack frontier backed by a deque, with a count of the states it holds
+    so that add, remove and contains_state are all O(1).
+    """
+    def __init__(self):
+        self.frontier = deque()
+        self.states = {}
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def discard_state(self, state):
+        count = self.states[state]
+        if count == 1:
+            del self.states[state]
+        else:
+            self.states[state] = count - 1
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.pop()
+            self.discard_state(node.state)
+            return node
+
+
+class DequeQueueFrontier(DequeStackFrontier):
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.popleft()
+            self.discard_state(node.state)
+            return node
+
+
+class SearchStats():
+    """
+    Opt-in counters for a game-tree search, kept separately for each depth
+    below the root. Searches are given one as `stats`, and without one they
+    only pay for checking that `stats` is None at each position.
+    """
+    def __init__(self):
+        self.depth = -1
+        self.nodes = []
+        self.expanded = []
+        self.children = []
+        self.cutoffs = []
+        self.table_hits = []
+        self.seconds = []
+        self.started = []
+
+    def enter(self):
+        """Called when the search reaches a position, one level deeper."""
+        self.depth += 1
+        if self.depth == len(self.nodes):
+            for counts in [self.nodes, self.expanded, self.children,
+                           self.cutoffs, self.table_hits, self.seconds]:
+                counts.append(0)
+        self.nodes[self.depth] += 1
+        self.started.append(time.perf_counter())
+
+    def leave(self):
+        """Called when the search returns from the current position."""
+        self.seconds[self.depth] += time.perf_counter() - self.started.pop()
+        self.depth -= 1
+
+    def expand(self, children):
+        """Called when the current position is searched move by move."""
+        self.expanded[self.depth] += 1
+        self.children[self.depth] += children
+
+    def cutoff(self):
+        """Called when the remaining moves of the current position are pruned."""
+        self.cutoffs[self.depth] += 1
+
+    def table_hit(self):
+        """Called when the value of the current position is already known."""
+        self.table_hits[self.depth] += 1
+
+    def as_dict(self):
+        """
+        Returns the totals and the counts at each depth, ready for JSON.
+        Seconds at a depth are spent in the searches of positions at that
+        depth, including everything below them.
+        """
+        def branching(expanded, children):
+            return children / expanded if expanded else None
+
+        return {
+            "nodes": sum(self.nodes),
+            "max_depth": len(self.nodes) - 1,
+            "cutoffs": sum(self.cutoffs),
+            "table_hits": sum(self.table_hits),
+            "branching_factor": branching(sum(self.expanded), sum(self.children)),
+            "seconds": self.seconds[0] if self.seconds else 0,
+            "depths": [
+                {
+                    "depth": depth,
+                    "nodes": self.nodes[depth],
+                    "cutoffs": self.cutoffs[depth],
+                    "table_hits": self.table_hits[depth],
+                    "branching_factor": branching(self.expanded[depth], self.children[depth]),
+                    "seconds": self.seconds[depth]
+                }
+                for depth in range(len(self.nodes))
+            ]
+        }
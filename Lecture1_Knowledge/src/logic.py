@@ -1,7 +1,54 @@
+import copy
 import itertools
+import weakref
+
+from sat import Solver
+
+# Knowledge bases with more symbols than this are checked with the SAT
+# solver instead of by enumerating every model
+ENUMERATION_LIMIT = 20
+
+# Models are enumerated in chunks of 2 ** CHUNK_BITS at a time, one bit per model
+CHUNK_BITS = 16
+
+# What a knowledge base says about a query, as returned by model_check_many
+ENTAILED = "entailed"
+REFUTED = "refuted"
+UNKNOWN = "unknown"
+
+# Most operands combined on one line of compiled code
+COMPILE_CHUNK = 32
+
+
+class EvaluationException(Exception):
+    pass
 
 
 class Sentence():
+    """
+    Every kind of sentence but And is immutable and interned: building a
+    sentence equal to one still in use returns that same object, so equal
+    sentences share memory and compare by identity. Each sentence keeps its
+    hash, its symbols and its depth, worked out once when it is built.
+    """
+    __slots__ = ("_hash", "_symbols", "depth", "__weakref__")
+
+    def __new__(cls, *args, **kwargs):
+        sentence = object.__new__(cls)
+        sentence._hash = object.__hash__(sentence)
+        sentence._symbols = frozenset()
+        sentence.depth = 0
+        return sentence
+
+    def __hash__(self):
+        return self._hash
+
+    def __copy__(self):
+        # Interned sentences are immutable, so copies are the same object
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
@@ -12,14 +59,41 @@ class Sentence():
         return ""
 
     def symbols(self):
-        """Returns a set of all symbols in the logical sentence."""
-        return set()
+        """Returns a frozenset of all symbols in the logical sentence."""
+        return self._symbols
 
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
             raise TypeError("must be a logical sentence")
 
+    @classmethod
+    def intern(cls, fields, operands, symbols=None):
+        """
+        Returns the sentence of this class with `fields`, a dict from
+        attribute to value, building it if there is none in use yet.
+        `operands` are the sentences it is made of, and its symbols are
+        theirs unless given.
+        """
+        key = (cls,) + tuple(fields.values())
+        sentence = interned.get(key)
+        if sentence is not None:
+            return sentence
+
+        sentence = object.__new__(cls)
+        for name, value in fields.items():
+            setattr(sentence, name, value)
+        sentence._hash = hash(key)
+        if symbols is None:
+            symbols = frozenset().union(*[operand.symbols() for operand in operands])
+        sentence._symbols = symbols
+        sentence.depth = 1 + max([operand.depth for operand in operands], default=-1)
+        for operand in operands:
+            if isinstance(operand, And):
+                operand.frozen = True
+        interned[key] = sentence
+        return sentence
+
     @classmethod
     def parenthesize(cls, s):
         """Parenthesizes an expression if not already parenthesized."""
@@ -42,16 +116,18 @@ class Sentence():
             return f"({s})"
 
 
-class Symbol(Sentence):
+# Sentences in use, keyed by class and fields, as built by Sentence.intern
+interned = weakref.WeakValueDictionary()
 
-    def __init__(self, name):
-        self.name = name
 
-    def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
+class Symbol(Sentence):
+    __slots__ = ("name",)
 
-    def __hash__(self):
-        return hash(("symbol", self.name))
+    def __new__(cls, name):
+        return cls.intern({"name": name}, [], frozenset([name]))
+
+    def __reduce__(self):
+        return (Symbol, (self.name,))
 
     def __repr__(self):
         return self.name
@@ -65,20 +141,16 @@ class Symbol(Sentence):
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
-
 
 class Not(Sentence):
-    def __init__(self, operand):
-        Sentence.validate(operand)
-        self.operand = operand
+    __slots__ = ("operand",)
 
-    def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+    def __new__(cls, operand):
+        Sentence.validate(operand)
+        return cls.intern({"operand": operand}, [operand])
 
-    def __hash__(self):
-        return hash(("not", hash(self.operand)))
+    def __reduce__(self):
+        return (Not, (self.operand,))
 
     def __repr__(self):
         return f"Not({self.operand})"
@@ -89,23 +161,47 @@ class Not(Sentence):
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
-
 
 class And(Sentence):
+    """
+    The one mutable kind of sentence, so that knowledge can be built up
+    with add. Its hash and symbols are worked out when first asked for and
+    again after every add. An And that is part of another sentence is
+    frozen, since that sentence's hash depends on it.
+    """
+    __slots__ = ("conjuncts", "frozen")
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
+            if isinstance(conjunct, And):
+                conjunct.frozen = True
         self.conjuncts = list(conjuncts)
+        self.frozen = False
+        self._hash = None
+        self._symbols = None
+        self.depth = 1 + max([conjunct.depth for conjunct in conjuncts], default=-1)
 
     def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return self is other or (
+            isinstance(other, And)
+            and hash(self) == hash(other)
+            and self.conjuncts == other.conjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
-        )
+        if self._hash is None:
+            self._hash = hash((And, tuple(self.conjuncts)))
+        return self._hash
+
+    def __reduce__(self):
+        return (And, tuple(self.conjuncts))
+
+    def __copy__(self):
+        return And(*self.conjuncts)
+
+    def __deepcopy__(self, memo):
+        return And(*[copy.deepcopy(conjunct, memo) for conjunct in self.conjuncts])
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -115,7 +211,14 @@ class And(Sentence):
 
     def add(self, conjunct):
         Sentence.validate(conjunct)
+        if self.frozen:
+            raise Exception("cannot add to a conjunction inside another sentence")
+        if isinstance(conjunct, And):
+            conjunct.frozen = True
         self.conjuncts.append(conjunct)
+        self._hash = None
+        self._symbols = None
+        self.depth = max(self.depth, conjunct.depth + 1)
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
@@ -127,22 +230,23 @@ class And(Sentence):
                            for conjunct in self.conjuncts])
 
     def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+        if self._symbols is None:
+            self._symbols = frozenset().union(
+                *[conjunct.symbols() for conjunct in self.conjuncts]
+            )
+        return self._symbols
 
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+    __slots__ = ("disjuncts",)
+
+    def __new__(cls, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+        return cls.intern({"disjuncts": disjuncts}, disjuncts)
 
-    def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
-
-    def __hash__(self):
-        return hash(
-            ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
-        )
+    def __reduce__(self):
+        return (Or, self.disjuncts)
 
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
@@ -157,24 +261,18 @@ class Or(Sentence):
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
-
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+    __slots__ = ("antecedent", "consequent")
+
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
+        return cls.intern({"antecedent": antecedent, "consequent": consequent},
+                          [antecedent, consequent])
 
-    def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
-
-    def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+    def __reduce__(self):
+        return (Implication, (self.antecedent, self.consequent))
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
@@ -188,76 +286,496 @@ class Implication(Sentence):
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
-
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
+        return cls.intern({"left": left, "right": right}, [left, right])
 
-    def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
-
-    def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+    def __reduce__(self):
+        return (Biconditional, (self.left, self.right))
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
 
     def evaluate(self, model):
-        return ((self.left.evaluate(model)
-                 and self.right.evaluate(model))
-                or (not self.left.evaluate(model)
-                    and not self.right.evaluate(model)))
+        return self.left.evaluate(model) == self.right.evaluate(model)
 
     def formula(self):
         left = Sentence.parenthesize(str(self.left))
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
 
-
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
-
-    def check_all(knowledge, query, symbols, model):
-        """Checks if knowledge base entails query, given a particular model."""
-
-        # If model has an assignment for each symbol
-        if not symbols:
-
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
-            return True
+class CNF():
+    """
+    Clauses in conjunctive normal form, over integer variables as in sat.py,
+    built from sentences by Tseitin encoding: every compound sentence gets a
+    new variable constrained to equal its value, so the clauses grow linearly
+    with the size of the sentence.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.variables = dict()
+        self.num_variables = 0
+
+        # Variable or literal already standing for each sentence
+        self.literals = dict()
+
+    def solver(self):
+        """Returns an incremental solver holding the clauses so far."""
+        solver = Solver()
+        for clause in self.clauses:
+            solver.add_clause(clause)
+        return solver
+
+    def new_variable(self):
+        self.num_variables += 1
+        return self.num_variables
+
+    def variable(self, name):
+        """Returns the variable for a symbol name."""
+        if name not in self.variables:
+            self.variables[name] = self.new_variable()
+        return self.variables[name]
+
+    def add(self, sentence):
+        """Adds clauses that hold exactly when `sentence` is true."""
+        Sentence.validate(sentence)
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append([self.literal(disjunct) for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            self.clauses.append([-self.literal(sentence.antecedent),
+                                 self.literal(sentence.consequent)])
         else:
+            self.clauses.append([self.literal(sentence)])
+
+    def literal(self, sentence):
+        """
+        Returns a literal that is true exactly when `sentence` is true,
+        adding the clauses that define it.
+        """
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.literal(sentence.operand)
+        if sentence in self.literals:
+            return self.literals[sentence]
+
+        if isinstance(sentence, And):
+            operands = [self.literal(conjunct) for conjunct in sentence.conjuncts]
+            v = self.new_variable()
+            # v => every operand, and all operands => v
+            for operand in operands:
+                self.clauses.append([-v, operand])
+            self.clauses.append([v] + [-operand for operand in operands])
+        elif isinstance(sentence, Or):
+            operands = [self.literal(disjunct) for disjunct in sentence.disjuncts]
+            v = self.new_variable()
+            # any operand => v, and v => some operand
+            for operand in operands:
+                self.clauses.append([v, -operand])
+            self.clauses.append([-v] + operands)
+        elif isinstance(sentence, Implication):
+            a = self.literal(sentence.antecedent)
+            b = self.literal(sentence.consequent)
+            v = self.new_variable()
+            self.clauses.extend([[-v, -a, b], [v, a], [v, -b]])
+        elif isinstance(sentence, Biconditional):
+            a = self.literal(sentence.left)
+            b = self.literal(sentence.right)
+            v = self.new_variable()
+            self.clauses.extend([[-v, -a, b], [-v, a, -b], [v, a, b], [v, -a, -b]])
+        else:
+            raise TypeError("must be a logical sentence")
 
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
-
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
+        self.literals[sentence] = v
+        return v
+
+
+def satisfiable(*sentences):
+    """Checks if some model makes every sentence true, using the SAT solver."""
+    cnf = CNF()
+    for sentence in sentences:
+        cnf.add(sentence)
+    return cnf.solver().solve() is not None
+
+
+class KnowledgeBase():
+    """
+    Knowledge base that grows one sentence at a time, for asking many
+    questions as facts come in.
+
+    Sentences are turned into clauses once, when they are added, and handed
+    to one incremental SAT solver that keeps them, with every clause it
+    learns, for all later queries. Sentences can also be pushed as
+    assumptions, which hold until they are popped again.
+    """
+
+    def __init__(self, *sentences):
+        self.cnf = CNF()
+        self.solver = Solver()
+        self.sentences = []
+        self.assumptions = []
+        for sentence in sentences:
+            self.add(sentence)
+
+    def __str__(self):
+        return " ∧ ".join([Sentence.parenthesize(sentence.formula())
+                           for sentence in self.sentences])
+
+    def literal(self, sentence):
+        """
+        Returns the literal for a sentence, giving the solver the clauses
+        that define it. These only define new variables, so they hold in
+        every model of the knowledge base.
+        """
+        literal = self.cnf.literal(sentence)
+        self.flush()
+        return literal
+
+    def flush(self):
+        for clause in self.cnf.clauses:
+            self.solver.add_clause(clause)
+        self.cnf.clauses = []
+        # Symbols in no clause yet still get a value in every model
+        self.solver.reserve(self.cnf.num_variables)
+
+    def add(self, sentence):
+        """Adds a sentence for good."""
+        self.cnf.add(sentence)
+        self.flush()
+        self.sentences.append(sentence)
+
+    def push(self, sentence):
+        """Assumes a sentence until the matching pop."""
+        Sentence.validate(sentence)
+        self.assumptions.append(self.literal(sentence))
+
+    def pop(self):
+        """Drops the most recently pushed assumption."""
+        if not self.assumptions:
+            raise Exception("no assumption to pop")
+        self.assumptions.pop()
+
+    def satisfiable(self, *sentences):
+        """
+        Checks if some model makes the knowledge base, the current
+        assumptions and `sentences` true.
+        """
+        literals = [self.literal(sentence) for sentence in sentences]
+        return self.solver.solve(self.assumptions + literals) is not None
+
+    def entails(self, query):
+        """Checks if the knowledge base and assumptions entail query."""
+        return not self.satisfiable(Not(query))
+
+    def check(self, query):
+        """
+        Returns ENTAILED, REFUTED or UNKNOWN for a query, as
+        model_check_many does.
+        """
+        return self.check_many([query])[0]
+
+    def check_many(self, queries):
+        """
+        Returns ENTAILED, REFUTED or UNKNOWN for each query, as
+        model_check_many does.
+
+        Every model found answers, for every query, whether it can be true
+        or whether it can be false, so a query only needs a solver call of
+        its own while one of the two is still open.
+        """
+        literals = [self.literal(query) for query in queries]
+        possible = [[False, False] for _ in queries]
+
+        def record(model):
+            # The solver assigns every variable, including the ones that
+            # stand for the queries
+            for literal, seen in zip(literals, possible):
+                seen[0 if model[abs(literal)] == (literal > 0) else 1] = True
+
+        model = self.solver.solve(self.assumptions)
+        if model is not None:
+            record(model)
+            for literal, seen in zip(literals, possible):
+                for value in [True, False]:
+                    if not seen[0 if value else 1]:
+                        model = self.solver.solve(
+                            self.assumptions + [literal if value else -literal]
+                        )
+                        if model is not None:
+                            record(model)
+        return outcomes(possible)
 
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
 
-            # Ensure entailment holds in both models
-            return (check_all(knowledge, query, remaining, model_true) and
-                    check_all(knowledge, query, remaining, model_false))
+def model_check(knowledge, query):
+    """Checks if knowledge base entails query."""
 
     # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    symbols = knowledge.symbols() | query.symbols()
+
+    # Large knowledge bases entail the query if no model makes the
+    # knowledge true and the query false
+    if len(symbols) > ENUMERATION_LIMIT:
+        return not satisfiable(knowledge, Not(query))
+    return model_check_columns(knowledge, query, symbols)
+
+
+def model_check_many(knowledge, queries):
+    """
+    Checks many queries against one knowledge base, enumerating or solving
+    the knowledge base once for all of them.
+
+    Returns a list with ENTAILED, REFUTED or UNKNOWN for each query, in
+    order: ENTAILED if the knowledge base entails the query, REFUTED if it
+    entails the query's negation, and UNKNOWN if it entails neither. A
+    knowledge base with no models entails every query.
+    """
+    symbols = knowledge.symbols().union(*[query.symbols() for query in queries])
+    if len(symbols) > ENUMERATION_LIMIT:
+        possible = model_check_many_sat(knowledge, queries, symbols)
+    else:
+        possible = model_check_many_columns(knowledge, queries, symbols)
+    return outcomes(possible)
+
+
+def outcomes(possible):
+    """
+    Returns ENTAILED, REFUTED or UNKNOWN for each query, given for each
+    (query can be true, query can be false).
+    """
+    results = []
+    for can_be_true, can_be_false in possible:
+        if not can_be_false:
+            results.append(ENTAILED)
+        elif not can_be_true:
+            results.append(REFUTED)
+        else:
+            results.append(UNKNOWN)
+    return results
+
+
+def model_check_many_columns(knowledge, queries, symbols):
+    """
+    Returns, for each query, whether it is true in some model of the
+    knowledge base and whether it is false in some model, by enumerating
+    models in chunks as model_check_columns does.
+    """
+    symbols = sorted(symbols)
+    knowledge = compile_columns(knowledge, symbols)
+    queries = [compile_columns(query, symbols) for query in queries]
+    possible = [[False, False] for _ in queries]
+
+    bits = min(len(symbols), CHUNK_BITS)
+    mask = (1 << (1 << bits)) - 1
+    low = symbol_columns(bits)
+    for chunk in range(1 << (len(symbols) - bits)):
+        high = [mask if chunk >> j & 1 else 0 for j in range(len(symbols) - bits)]
+        columns = low + high
+        holds = knowledge(columns, mask)
+        if not holds:
+            continue
+
+        undecided = False
+        for query, seen in zip(queries, possible):
+            if seen[0] and seen[1]:
+                continue
+            true = query(columns, mask) & holds
+            seen[0] = seen[0] or true != 0
+            seen[1] = seen[1] or true != holds
+            undecided = undecided or not (seen[0] and seen[1])
+
+        # Stop once every query is known to be unknown
+        if not undecided:
+            break
+    return possible
+
+
+def model_check_many_sat(knowledge, queries, symbols):
+    """
+    Returns, for each query, whether it is true in some model of the
+    knowledge base and whether it is false in some model, using one
+    incremental SAT solver with each query as an assumption. Every model
+    found answers one of the two questions for every query, so a query only
+    needs a solver call of its own while one of the two is still open.
+    """
+    cnf = CNF()
+    cnf.add(knowledge)
+    literals = [cnf.literal(query) for query in queries]
+    symbols = sorted(symbols)
+    queries = [compile_sentence(query, symbols) for query in queries]
+    possible = [[False, False] for _ in queries]
+
+    def record(model):
+        # Symbols the solver left free can take any value, so use False
+        bits = 0
+        for i, name in enumerate(symbols):
+            if model.get(cnf.variables.get(name), False):
+                bits |= 1 << i
+        for query, seen in zip(queries, possible):
+            seen[1 - query(bits)] = True
+
+    solver = cnf.solver()
+    model = solver.solve()
+    if model is None:
+        return possible
+    record(model)
+
+    for literal, seen in zip(literals, possible):
+        for value in [True, False]:
+            if not seen[0 if value else 1]:
+                model = solver.solve([literal if value else -literal])
+                if model is not None:
+                    record(model)
+    return possible
+
+
+def generate(sentence, symbols, parameters, leaf, true):
+    """
+    Compiles a sentence into a Python function with one assignment per
+    distinct subsentence, using the bitwise operators & | ^ on integers.
+
+    `leaf` formats the value of the symbol at index {i} in `symbols`, and
+    `true` is the value with every bit set, so that NOT x is `true ^ x`.
+    """
+    index = {name: i for i, name in enumerate(symbols)}
+    lines = []
+    names = dict()
+
+    def combine(operator, operands):
+        # Chain a few operands per line to keep expressions shallow
+        while len(operands) > COMPILE_CHUNK:
+            operands = [emit(f" {operator} ".join(operands[i:i + COMPILE_CHUNK]))
+                        for i in range(0, len(operands), COMPILE_CHUNK)]
+        return emit(f" {operator} ".join(operands))
+
+    def emit(expression):
+        name = f"t{len(lines)}"
+        lines.append(f"    {name} = {expression}")
+        return name
+
+    def value(sentence):
+        if isinstance(sentence, Symbol):
+            if sentence.name not in index:
+                raise EvaluationException(f"variable {sentence.name} not in model")
+            return leaf.format(i=index[sentence.name])
+        if sentence in names:
+            return names[sentence]
+
+        if isinstance(sentence, Not):
+            name = emit(f"{true} ^ {value(sentence.operand)}")
+        elif isinstance(sentence, And):
+            operands = [value(conjunct) for conjunct in sentence.conjuncts]
+            name = combine("&", operands) if operands else emit(true)
+        elif isinstance(sentence, Or):
+            operands = [value(disjunct) for disjunct in sentence.disjuncts]
+            name = combine("|", operands) if operands else emit("0")
+        elif isinstance(sentence, Implication):
+            antecedent = value(sentence.antecedent)
+            consequent = value(sentence.consequent)
+            name = emit(f"({true} ^ {antecedent}) | {consequent}")
+        elif isinstance(sentence, Biconditional):
+            left = value(sentence.left)
+            right = value(sentence.right)
+            name = emit(f"{true} ^ {left} ^ {right}")
+        else:
+            raise TypeError("must be a logical sentence")
+        names[sentence] = name
+        return name
+
+    # Conjuncts of a top-level And are checked as soon as they are known,
+    # so that models which fail early skip the rest of the sentence
+    def flatten(sentence):
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                yield from flatten(conjunct)
+        else:
+            yield sentence
 
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+    conjuncts = list(flatten(sentence))
+    if len(conjuncts) > 1:
+        operands = []
+        for conjunct in conjuncts:
+            operands.append(value(conjunct))
+            lines.append(f"    if not {operands[-1]}: return 0")
+        result = combine("&", operands)
+    else:
+        result = value(sentence)
+
+    source = "\n".join([f"def evaluate({parameters}):"] + lines + [f"    return {result}"])
+    namespace = dict()
+    exec(compile(source, "<sentence>", "exec"), namespace)
+    return namespace["evaluate"]
+
+
+def compile_sentence(sentence, symbols):
+    """
+    Returns a function that evaluates the sentence in a model given as an
+    int, where bit i is the value of the symbol named symbols[i]. The
+    function returns 1 if the sentence is true and 0 otherwise.
+    """
+    return generate(sentence, symbols, "m", "(m >> {i} & 1)", "1")
+
+
+def compile_columns(sentence, symbols):
+    """
+    Returns a function f(columns, mask) that evaluates the sentence in many
+    models at once. columns[i] holds the values of the symbol named
+    symbols[i] as the bits of an int, one bit per model, and mask has a bit
+    set for every model. The result has a bit set for every model in which
+    the sentence is true.
+    """
+    return generate(sentence, symbols, "c, M", "c[{i}]", "M")
+
+
+def symbol_columns(bits):
+    """
+    Returns the columns of the first `bits` symbols over 2 ** bits models:
+    column j has bit m set if bit j of model m is set.
+    """
+    size = 1 << bits
+    columns = []
+    for j in range(bits):
+        # 2 ** j models with the symbol false, then 2 ** j with it true
+        column = ((1 << (1 << j)) - 1) << (1 << j)
+        width = 1 << (j + 1)
+        while width < size:
+            column |= column << width
+            width *= 2
+        columns.append(column)
+    return columns
+
+
+def model_check_columns(knowledge, query, symbols):
+    """
+    Checks if knowledge base entails query by enumerating every model in
+    chunks, evaluating each sentence over a whole chunk at once.
+
+    Within a chunk, the first CHUNK_BITS symbols take every combination of
+    values and the rest are fixed, so their columns are all ones or zeros.
+    """
+    symbols = sorted(symbols)
+    knowledge = compile_columns(knowledge, symbols)
+    query = compile_columns(query, symbols)
+
+    bits = min(len(symbols), CHUNK_BITS)
+    mask = (1 << (1 << bits)) - 1
+    low = symbol_columns(bits)
+    for chunk in range(1 << (len(symbols) - bits)):
+        high = [mask if chunk >> j & 1 else 0 for j in range(len(symbols) - bits)]
+        columns = low + high
+
+        # A model where the knowledge base holds and the query does not
+        # is a counterexample
+        holds = knowledge(columns, mask)
+        if holds and holds & ~query(columns, mask):
+            return False
+    return True
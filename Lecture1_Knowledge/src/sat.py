@@ -0,0 +1,272 @@
+"""
+Satisfiability of propositional formulas in conjunctive normal form.
+
+A formula is a list of clauses, each a list of literals: a positive integer
+n for variable n being true, or -n for it being false, as in DIMACS files.
+"""
+
+import heapq
+
+# Activities are scaled down once one grows past this
+ACTIVITY_LIMIT = 1e100
+
+
+class Solver():
+    """
+    Incremental conflict-driven clause learning (CDCL) solver.
+
+    Clauses are added once and kept, and solve() may be called any number of
+    times with different assumptions: literals taken as true for that call
+    only. Every clause the solver learns from a conflict follows from the
+    added clauses alone, never from assumptions, so learned clauses are kept
+    between calls and later calls start from everything learned so far.
+
+    Each clause watches its first two literals, and is only looked at when
+    one of them becomes false, to find another literal to watch or to
+    propagate the other watched literal.
+    """
+
+    def __init__(self):
+        self.num_variables = 0
+        self.clauses = []
+        self.learned = []
+        self.watches = dict()
+        self.unsatisfiable = False
+
+        # Current assignment, indexed by variable: True, False or None, with
+        # the decision level and the clause that forced each value
+        self.values = [None]
+        self.levels = [0]
+        self.reasons = [None]
+
+        # Assigned literals in order, where each decision level starts on
+        # the trail, and how far along the trail propagation has got
+        self.trail = []
+        self.trail_limits = []
+        self.head = 0
+
+        # Decision heuristics: variables in recent conflicts are tried first,
+        # with the value they last had. The heap holds (-activity, variable)
+        # for every unassigned variable, and may also hold stale entries,
+        # which are skipped when they come up.
+        self.activity = [0.0]
+        self.phases = [False]
+        self.bump = 1.0
+        self.heap = []
+
+    def reserve(self, variable):
+        """Makes room for variables up to `variable`."""
+        while self.num_variables < variable:
+            self.num_variables += 1
+            self.values.append(None)
+            self.levels.append(0)
+            self.reasons.append(None)
+            self.activity.append(0.0)
+            self.phases.append(False)
+            heapq.heappush(self.heap, (-0.0, self.num_variables))
+
+    def value(self, literal):
+        value = self.values[abs(literal)]
+        if value is None or literal > 0:
+            return value
+        return not value
+
+    def add_clause(self, clause):
+        """Adds a clause, a list of literals, for all later calls to solve."""
+        self.backtrack(0)
+        clause = list(dict.fromkeys(clause))
+        for literal in clause:
+            self.reserve(abs(literal))
+        if any(-literal in clause for literal in clause):
+            return
+        if any(self.value(literal) is True for literal in clause):
+            return
+
+        # Literals already false for good can be left out
+        clause = [literal for literal in clause if self.value(literal) is None]
+        if not clause:
+            self.unsatisfiable = True
+        elif len(clause) == 1:
+            self.enqueue(clause[0], None)
+        else:
+            self.clauses.append(clause)
+            self.watch(clause)
+
+    def watch(self, clause):
+        for literal in clause[:2]:
+            self.watches.setdefault(literal, []).append(clause)
+
+    def enqueue(self, literal, reason):
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Assigns every literal forced by unit clauses.
+        Returns a clause with every literal false, or None.
+        """
+        while self.head < len(self.trail):
+            false = -self.trail[self.head]
+            self.head += 1
+            watching = self.watches.get(false, [])
+            self.watches[false] = kept = []
+            for n, clause in enumerate(watching):
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], clause[0]
+                other = clause[0]
+                if self.value(other) is True:
+                    kept.append(clause)
+                    continue
+
+                # Watch another literal that is not false, if there is one
+                for i in range(2, len(clause)):
+                    if self.value(clause[i]) is not False:
+                        clause[1], clause[i] = clause[i], clause[1]
+                        self.watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if self.value(other) is False:
+                        kept.extend(watching[n + 1:])
+                        return clause
+                    self.enqueue(other, clause)
+        return None
+
+    def analyze(self, conflict):
+        """
+        Learns a clause from a conflict by resolving it with the reasons of
+        the literals assigned at the current level, until one such literal
+        is left (the first unique implication point).
+
+        Returns the learned clause, with that literal first, and the level
+        to go back to, where the clause forces it.
+        """
+        level = len(self.trail_limits)
+        seen = set()
+        learned = [None]
+        pending = 0
+        index = len(self.trail) - 1
+        clause = conflict
+        literal = None
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen or self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.activity[variable] += self.bump
+                if self.activity[variable] > ACTIVITY_LIMIT:
+                    self.rescale()
+                if self.levels[variable] == level:
+                    pending += 1
+                else:
+                    learned.append(other)
+
+            # Resolve with the reason of the latest literal involved
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)]
+
+        learned[0] = -literal
+        self.bump *= 1.05
+        if len(learned) == 1:
+            return learned, 0
+
+        # Watch the literal that becomes false last, from the highest level
+        highest = max(range(1, len(learned)), key=lambda i: self.levels[abs(learned[i])])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def rescale(self):
+        """Scales every activity down before they overflow."""
+        self.activity = [activity / ACTIVITY_LIMIT for activity in self.activity]
+        self.bump /= ACTIVITY_LIMIT
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuilds the heap from the unassigned variables, dropping stale entries."""
+        self.heap = [(-self.activity[variable], variable)
+                     for variable in range(1, self.num_variables + 1)
+                     if self.values[variable] is None]
+        heapq.heapify(self.heap)
+
+    def backtrack(self, level):
+        """Undoes every assignment made above decision level `level`."""
+        if len(self.trail_limits) <= level:
+            return
+        start = self.trail_limits[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phases[variable] = literal > 0
+            self.values[variable] = None
+            self.reasons[variable] = None
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.trail_limits[level:]
+        self.head = min(self.head, start)
+        if len(self.heap) > 4 * self.num_variables:
+            self.rebuild()
+
+    def decide(self):
+        """Returns the unassigned variable with the highest activity, or None."""
+        while self.heap:
+            activity, variable = heapq.heappop(self.heap)
+            if self.values[variable] is None and -activity == self.activity[variable]:
+                return variable
+        return None
+
+    def solve(self, assumptions=()):
+        """
+        Returns a dict from variable to bool that satisfies every clause and
+        makes every assumption true, or None if there is none.
+        """
+        if self.unsatisfiable:
+            return None
+        for literal in assumptions:
+            self.reserve(abs(literal))
+        self.backtrack(0)
+
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                if not self.trail_limits:
+                    self.unsatisfiable = True
+                    return None
+                learned, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learned) == 1:
+                    self.enqueue(learned[0], None)
+                else:
+                    self.learned.append(learned)
+                    self.watch(learned)
+                    self.enqueue(learned[0], learned)
+                continue
+
+            # Take the assumptions first, one decision level each
+            level = len(self.trail_limits)
+            if level < len(assumptions):
+                literal = assumptions[level]
+                if self.value(literal) is False:
+                    self.backtrack(0)
+                    return None
+                self.trail_limits.append(len(self.trail))
+                if self.value(literal) is None:
+                    self.enqueue(literal, None)
+                continue
+
+            variable = self.decide()
+            if variable is None:
+                model = {variable: self.values[variable]
+                         for variable in range(1, self.num_variables + 1)}
+                self.backtrack(0)
+                return model
+            self.trail_limits.append(len(self.trail))
+            self.enqueue(variable if self.phases[variable] else -variable, None)